@@ -4,7 +4,10 @@ from .summarize import BookSummary, ChapterInfo, EPUBSummarizer
 from .llm import (
 	BaseSummarizer,
 	ClaudeSummarizer,
+	OllamaSummarizer,
 	OpenAISummarizer,
+	SummaryCache,
+	create_all_functions,
 	create_summarizer_functions,
 	create_refine_functions,
 )
@@ -18,6 +21,9 @@ __all__ = [
 	'BaseSummarizer',
 	'ClaudeSummarizer',
 	'OpenAISummarizer',
+	'OllamaSummarizer',
+	'SummaryCache',
+	'create_all_functions',
 	'create_summarizer_functions',
 	'create_refine_functions',
 ]
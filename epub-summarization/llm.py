@@ -5,26 +5,497 @@ Provides LLM API integration for text summarization.
 Supports Claude (Anthropic) and OpenAI GPT models.
 """
 
+import asyncio
+import hashlib
+import heapq
+import json
 import os
+import random
+import sqlite3
+import string
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from collections import OrderedDict
+from functools import cached_property, lru_cache, partial
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 
 import anthropic
 import openai
 
+try:
+	import tiktoken
+except ImportError:
+	tiktoken = None
+
+try:
+	import h2  # noqa: F401  (enables HTTP/2 in httpx)
+
+	HTTP2_AVAILABLE = True
+except ImportError:
+	HTTP2_AVAILABLE = False
+
+# HTTP status codes worth retrying: rate limited (429) and Anthropic overloaded (529)
+RETRYABLE_STATUS_CODES = (429, 529)
+
+
+# Prompt templates, compiled once at import. Each prompt is an instruction block,
+# which only varies with the output language, followed by the per-call body. At
+# roughly a hundred tokens the instructions are far below the providers' minimum
+# cacheable prefix, so no prompt caching is requested for them.
+CHAPTER_INSTRUCTIONS = string.Template(
+	"""請為以下章節內容撰寫摘要。
+
+要求：
+- $lang_instruction
+- 摘要長度約 150-300 字
+- 抓取章節的核心概念和重點
+- 保持客觀、簡潔的風格"""
+)
+
+BOOK_INSTRUCTIONS = string.Template(
+	"""請根據以下各章節摘要，為整本書撰寫綜合摘要。
+
+要求：
+- $lang_instruction
+- 摘要長度約 500-800 字
+- 綜合全書的主旨、核心論點和結論
+- 呈現書籍的整體架構和邏輯脈絡
+- 保持客觀、學術的風格"""
+)
+
+REFINE_INITIAL_INSTRUCTIONS = string.Template(
+	"""請為以下書籍的第一個章節撰寫初始摘要。
+
+要求：
+- $lang_instruction
+- 摘要長度約 200-400 字
+- 抓取章節的核心概念和重點
+- 這是全書摘要的起點，後續會逐章精煉"""
+)
+
+REFINE_INSTRUCTIONS = string.Template(
+	"""請根據新的章節內容，精煉並擴充現有的書籍摘要。
+
+要求：
+- $lang_instruction
+- 將新章節的重點整合到現有摘要中
+- 保持摘要的連貫性和邏輯流暢
+- 摘要長度可隨內容增加適度擴展（依下方建議字數）
+- 避免重複，突出新增的核心概念
+- 保持客觀、學術的風格"""
+)
+
+FINALIZE_INSTRUCTIONS = string.Template(
+	"""請將以下逐章精煉的書籍摘要進行最終整理和潤飾。
+
+要求：
+- $lang_instruction
+- 確保結構完整、邏輯清晰
+- 摘要長度約 500-800 字
+- 涵蓋全書的主旨、核心論點、主要方法和結論
+- 保持客觀、學術的風格
+- 適當分段以提高可讀性"""
+)
+
+COMPRESS_INSTRUCTIONS = string.Template(
+	"""請將以下書籍摘要壓縮為重點條列。
+
+要求：
+- $lang_instruction
+- 總長度不超過 400 字
+- 只保留核心概念、論點和脈絡
+- 每個重點一行，以「- 」開頭"""
+)
+
+CHAPTER_BODY = string.Template(
+	"""章節標題：$title
+
+章節內容：
+$content
+
+請直接輸出摘要內容，不需要任何前綴或標題。"""
+)
+
+BOOK_BODY = string.Template(
+	"""書名：$book_title
+
+各章節摘要：
+$chapter_summaries
+
+請直接輸出全書摘要內容，不需要任何前綴或標題。"""
+)
+
+REFINE_INITIAL_BODY = string.Template(
+	"""書名：$book_title
+章節 $chapter_index/$total_chapters：$new_title
+
+章節內容：
+$new_content
+
+請直接輸出摘要內容，不需要任何前綴或標題。"""
+)
+
+REFINE_BODY = string.Template(
+	"""書名：$book_title
+目前進度：章節 $chapter_index/$total_chapters
+建議摘要長度：$suggested_length 字左右
+新章節標題：$new_title
+
+現有摘要：
+$existing_summary
+
+新章節內容：
+$new_content
+
+請直接輸出精煉後的完整摘要，不需要任何前綴或標題。"""
+)
+
+FINALIZE_BODY = string.Template(
+	"""書名：$book_title
+
+逐章精煉摘要：
+$refined_summary
+
+請直接輸出最終摘要，不需要任何前綴或標題。"""
+)
+
+COMPRESS_BODY = string.Template(
+	"""書名：$book_title
+
+現有摘要：
+$existing_summary
+
+請直接輸出條列內容，不需要任何前綴或標題。"""
+)
+
+
+# Common characters that only occur in Simplified Chinese, used to spot output that
+# drifted away from a Traditional Chinese target
+SIMPLIFIED_ONLY_CHARS = frozenset(
+	'这个们说为时国会来对经发与过动还进学关样现实应该问题没开长东书见话让车边门间点'
+	'从产业认无种员图处队气电总条头将义论观么结构读讨习虽览词类计设历'
+)
+
+
+def _prompt(instructions: str, body: str) -> str:
+	"""Join a prompt's instruction block and per-call body."""
+	return f'{instructions}\n\n{body}'
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+	"""
+	Get the retry delay for a rate-limit error.
+
+	Returns:
+		Seconds suggested by the retry-after header (0 if absent), or None if
+		the error should not be retried.
+	"""
+	if not isinstance(error, (anthropic.APIStatusError, openai.APIStatusError)):
+		return None
+	if error.status_code not in RETRYABLE_STATUS_CODES:
+		return None
+	retry_after = error.response.headers.get('retry-after')
+	try:
+		return float(retry_after) if retry_after else 0.0
+	except ValueError:
+		return 0.0
+
+
+class SummaryCache:
+	"""Persistent SQLite cache of LLM responses keyed by model and prompt."""
+
+	DEFAULT_PATH = os.path.join(
+		os.path.expanduser('~'), '.cache', 'epub-summarization', 'summaries.sqlite'
+	)
+
+	def __init__(self, path: Optional[str] = None):
+		"""
+		Open (or create) the cache database.
+
+		Args:
+			path: Database file path. Defaults to ~/.cache/epub-summarization/summaries.sqlite.
+		"""
+		self.path = path or self.DEFAULT_PATH
+		if self.path != ':memory:':
+			os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+		self._lock = threading.Lock()
+		self._conn = sqlite3.connect(self.path, check_same_thread=False)
+		self._conn.execute('PRAGMA journal_mode=WAL')
+		self._conn.execute(
+			'CREATE TABLE IF NOT EXISTS summaries ('
+			'key TEXT PRIMARY KEY, model TEXT, value TEXT, created_at INTEGER)'
+		)
+		self._conn.commit()
+
+	@staticmethod
+	def make_key(model: str, prompt: str) -> str:
+		"""Build the cache key for a model and prompt."""
+		return hashlib.sha256(f'{model}\0{prompt}'.encode()).hexdigest()
+
+	def get(self, key: str) -> Optional[str]:
+		"""Get a cached response, or None if missing."""
+		with self._lock:
+			row = self._conn.execute('SELECT value FROM summaries WHERE key = ?', (key,)).fetchone()
+		return row[0] if row else None
+
+	def put(self, key: str, value: str, model: str = '') -> None:
+		"""Store a response."""
+		with self._lock:
+			self._conn.execute(
+				'INSERT OR REPLACE INTO summaries (key, model, value, created_at) '
+				'VALUES (?, ?, ?, ?)',
+				(key, model, value, int(time.time())),
+			)
+			self._conn.commit()
+
+	def close(self) -> None:
+		"""Close the database connection."""
+		self._conn.close()
+
 
 class BaseSummarizer(ABC):
 	"""Abstract base class for LLM summarizers."""
 
-	def __init__(self, max_tokens: int = 4096):
+	SUPPORTS_BATCH_API = False
+	BATCH_POLL_INTERVAL = 30  # seconds between batch status checks
+	MAX_CONTENT_TOKENS = 100000  # token budget for chapter content in a single prompt
+	HTTP_TIMEOUT = 120.0  # seconds to wait for a response on the async client
+	# Refine passes re-send the running summary; past this many tokens it is
+	# replaced by a compressed bullet list plus its most recent raw tail. The list
+	# is reused for the summaries refined from it and rebuilt from the latest
+	# summary every REFINE_COMPRESS_EVERY passes, so only one pass in that many
+	# makes an extra call.
+	REFINE_SUMMARY_TOKENS = 1200
+	REFINE_TAIL_TOKENS = 400
+	REFINE_COMPRESS_EVERY = 4
+	COMPRESSED_CACHE_SIZE = 32  # refined summaries whose compressed form is kept
+
+	def __init__(
+		self,
+		max_tokens: int = 4096,
+		max_concurrency: int = 8,
+		max_retries: int = 5,
+		cache: Optional[SummaryCache] = None,
+	):
 		self.max_tokens = max_tokens
+		self.max_concurrency = max_concurrency
+		self.max_retries = max_retries
+		self.cache = cache
+		# Async resources per event loop; see _loop_resource()
+		self._loop_resources: Dict[asyncio.AbstractEventLoop, dict] = {}
+		self._thread_sem = threading.BoundedSemaphore(max_concurrency)
+		# Refined summary -> (compressed form it was refined from, passes since compression)
+		self._compressed: OrderedDict[str, Tuple[str, int]] = OrderedDict()
+		self._compressed_lock = threading.Lock()
+
+	def _http_client(self, sdk):
+		"""
+		Build a pooled async HTTP client for one of the provider SDKs.
+
+		The client class comes from the SDK itself so it matches the httpx build
+		the SDK was installed with.
+
+		Args:
+			sdk: The ``anthropic`` or ``openai`` module.
+		"""
+		limits = type(sdk.DEFAULT_CONNECTION_LIMITS)(
+			max_connections=self.max_concurrency * 2,
+			max_keepalive_connections=self.max_concurrency,
+		)
+		return sdk.DefaultAsyncHttpxClient(
+			http2=HTTP2_AVAILABLE,
+			limits=limits,
+			timeout=sdk.Timeout(self.HTTP_TIMEOUT, connect=10.0),
+		)
+
+	def _loop_resource(self, name: str, factory):
+		"""
+		Get an async resource for the running event loop, creating it on first use.
+
+		Semaphores and connection pools only work on the loop they were first used
+		on, so every loop (e.g. each asyncio.run() call) gets its own. Use
+		``async with summarizer`` (or aclose()) to close them when the loop is done.
+
+		Args:
+			name: Resource name.
+			factory: Callable that creates the resource.
+		"""
+		loop = asyncio.get_running_loop()
+		resources = self._loop_resources.get(loop)
+		if resources is None:
+			# A contended semaphore references its loop, so entries never expire on
+			# their own. Drop whatever earlier, now closed, loops left behind.
+			for other in list(self._loop_resources):
+				if other.is_closed():
+					self._loop_resources.pop(other, None)
+			resources = self._loop_resources[loop] = {}
+		if name not in resources:
+			resources[name] = factory()
+		return resources[name]
+
+	@property
+	def _sem(self) -> asyncio.Semaphore:
+		"""Concurrency limit for async API calls on the running event loop."""
+		return self._loop_resource('sem', lambda: asyncio.Semaphore(self.max_concurrency))
+
+	@property
+	def aclient(self):
+		"""Async client for the running event loop, created on first use."""
+		return self._loop_resource('aclient', self._create_aclient)
+
+	def _create_aclient(self):
+		"""Create the provider's async client. Must be implemented by subclasses."""
+		raise NotImplementedError(f'{type(self).__name__} has no async client')
+
+	async def aclose(self) -> None:
+		"""Close the running event loop's async client and connection pool, if opened."""
+		resources = self._loop_resources.pop(asyncio.get_running_loop(), {})
+		aclient = resources.get('aclient')
+		if aclient is not None:
+			await aclient.close()
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc, tb) -> None:
+		await self.aclose()
 
 	@abstractmethod
 	def _call_api(self, prompt: str) -> str:
 		"""Make API call to LLM. Must be implemented by subclasses."""
 		pass
 
-	def _get_language_instruction(self, language: str) -> str:
+	@abstractmethod
+	async def _acall_api(self, prompt: str) -> str:
+		"""Make async API call to LLM. Must be implemented by subclasses."""
+		pass
+
+	def _call_api_stream(self, prompt: str) -> Iterator[str]:
+		"""Stream the API response as text chunks. Defaults to a single chunk."""
+		yield self._call_api(prompt)
+
+	async def _acall_api_stream(self, prompt: str) -> AsyncIterator[str]:
+		"""Async variant of _call_api_stream."""
+		yield await self._acall_api(prompt)
+
+	async def _call_with_backoff(self, prompt: str) -> str:
+		"""Make async API call bounded by the concurrency limit, retrying on rate limits."""
+		async with self._sem:
+			for attempt in range(self.max_retries + 1):
+				try:
+					return await self._acall_api(prompt)
+				except (anthropic.APIStatusError, openai.APIStatusError) as e:
+					retry_after = _retry_after(e)
+					if retry_after is None or attempt == self.max_retries:
+						raise
+					await asyncio.sleep(max(retry_after, 2**attempt + random.random()))
+
+	def _call_with_retry(self, prompt: str) -> str:
+		"""Make sync API call bounded by the concurrency limit, retrying on rate limits."""
+		return self._with_retry(self._call_api, prompt)
+
+	def _with_retry(self, fn: Callable, *args, **kwargs):
+		"""Call a sync provider API function under the concurrency limit, with retries."""
+		with self._thread_sem:
+			for attempt in range(self.max_retries + 1):
+				try:
+					return fn(*args, **kwargs)
+				except (anthropic.APIStatusError, openai.APIStatusError) as e:
+					retry_after = _retry_after(e)
+					if retry_after is None or attempt == self.max_retries:
+						raise
+					time.sleep(max(retry_after, 2**attempt + random.random()))
+
+	def _call_cached(self, prompt: str, build: Optional[Callable[[], str]] = None) -> str:
+		"""
+		Make API call, serving repeated prompts from the cache.
+
+		Args:
+			prompt: Prompt to send. It is also the cache key.
+			build: Optional callable returning the prompt to send instead, e.g. one with
+				truncated content. It only runs on a cache miss, so cached requests never
+				pay for token counting.
+		"""
+		key = SummaryCache.make_key(self.model, prompt) if self.cache else None
+		cached = self.cache.get(key) if self.cache else None
+		if cached is not None:
+			return cached
+
+		result = self._call_with_retry(build() if build else prompt)
+		if self.cache is not None and result:
+			self.cache.put(key, result, self.model)
+		return result
+
+	async def _acall_cached(self, prompt: str, build: Optional[Callable[[], str]] = None) -> str:
+		"""Async variant of _call_cached."""
+		key = SummaryCache.make_key(self.model, prompt) if self.cache else None
+		cached = self.cache.get(key) if self.cache else None
+		if cached is not None:
+			return cached
+
+		# Token counting may call the provider API; keep it off the event loop
+		request = await asyncio.to_thread(build) if build else prompt
+		result = await self._call_with_backoff(request)
+		if self.cache is not None and result:
+			self.cache.put(key, result, self.model)
+		return result
+
+	def _stream_cached(
+		self, prompt: str, build: Optional[Callable[[], str]] = None
+	) -> Iterator[str]:
+		"""Stream the API response under the concurrency limit, serving repeats from the cache."""
+		key = SummaryCache.make_key(self.model, prompt) if self.cache else None
+		cached = self.cache.get(key) if self.cache else None
+		if cached is not None:
+			yield cached
+			return
+
+		# Build before taking the semaphore; token counting acquires it too
+		request = build() if build else prompt
+		chunks = []
+		with self._thread_sem:
+			for chunk in self._call_api_stream(request):
+				chunks.append(chunk)
+				yield chunk
+		if self.cache is not None and chunks:
+			self.cache.put(key, ''.join(chunks), self.model)
+
+	async def _astream_cached(
+		self, prompt: str, build: Optional[Callable[[], str]] = None
+	) -> AsyncIterator[str]:
+		"""Async variant of _stream_cached, bounded by the concurrency limit."""
+		key = SummaryCache.make_key(self.model, prompt) if self.cache else None
+		cached = self.cache.get(key) if self.cache else None
+		if cached is not None:
+			yield cached
+			return
+
+		request = await asyncio.to_thread(build) if build else prompt
+		chunks = []
+		async with self._sem:
+			async for chunk in self._acall_api_stream(request):
+				chunks.append(chunk)
+				yield chunk
+		if self.cache is not None and chunks:
+			self.cache.put(key, ''.join(chunks), self.model)
+
+	def _call_batch(self, prompts: Dict[str, str]) -> Dict[str, str]:
+		"""
+		Submit prompts through the provider's batch API and wait for the results.
+
+		Args:
+			prompts: Mapping of custom ID to prompt.
+
+		Returns:
+			Mapping of custom ID to response text. Failed requests are omitted.
+		"""
+		raise NotImplementedError(f'{type(self).__name__} does not support the batch API')
+
+	@staticmethod
+	@lru_cache(maxsize=8)
+	def _get_language_instruction(language: str) -> str:
 		"""Get the language instruction for prompts. Can be overridden by subclasses."""
 		return f'請務必使用{language}撰寫'
 
@@ -43,25 +514,118 @@ class BaseSummarizer(ABC):
 		if not content or not content.strip():
 			return ''
 
-		content = self._truncate_content(content)
+		return self._call_cached(*self._chapter_request(content, title, language))
 
-		lang_instruction = self._get_language_instruction(language)
-		prompt = f"""請為以下章節內容撰寫摘要。
+	async def asummarize_chapter(self, content: str, title: str, language: str = 'zh-TW') -> str:
+		"""Async variant of summarize_chapter."""
+		if not content or not content.strip():
+			return ''
 
-章節標題：{title}
+		return await self._acall_cached(*self._chapter_request(content, title, language))
 
-要求：
-- {lang_instruction}
-- 摘要長度約 150-300 字
-- 抓取章節的核心概念和重點
-- 保持客觀、簡潔的風格
+	def summarize_chapter_stream(
+		self, content: str, title: str, language: str = 'zh-TW'
+	) -> Iterator[str]:
+		"""
+		Stream a chapter summary as it is generated.
 
-章節內容：
-{content}
+		Args:
+			content: Plain text content of the chapter.
+			title: Chapter title.
+			language: Output language (default: Traditional Chinese).
 
-請直接輸出摘要內容，不需要任何前綴或標題。"""
+		Yields:
+			Summary text chunks.
+		"""
+		if not content or not content.strip():
+			return
 
-		return self._call_api(prompt)
+		yield from self._stream_cached(*self._chapter_request(content, title, language))
+
+	async def asummarize_chapter_stream(
+		self, content: str, title: str, language: str = 'zh-TW'
+	) -> AsyncIterator[str]:
+		"""Async variant of summarize_chapter_stream."""
+		if not content or not content.strip():
+			return
+
+		async for chunk in self._astream_cached(*self._chapter_request(content, title, language)):
+			yield chunk
+
+	def summarize_chapters_batch(
+		self, chapters: List[Tuple[str, str]], language: str = 'zh-TW'
+	) -> List[str]:
+		"""
+		Generate summaries for many chapters in a single batch API request.
+
+		Batch requests are billed at a discount and complete asynchronously
+		(usually within minutes, at most 24 hours), so this suits whole-book
+		runs that don't need interactive latency. Requests that fail in the
+		batch are retried one at a time through the regular API.
+
+		Args:
+			chapters: List of (content, title) pairs.
+			language: Output language (default: Traditional Chinese).
+
+		Returns:
+			Summaries in the same order as chapters.
+		"""
+		summaries = [''] * len(chapters)
+		prompts = {}
+		keys = {}
+		indices = {}
+		for i, (content, title) in enumerate(chapters):
+			if not content or not content.strip():
+				continue
+			prompt, build = self._chapter_request(content, title, language)
+			key = SummaryCache.make_key(self.model, prompt)
+			cached = self.cache.get(key) if self.cache else None
+			if cached is not None:
+				summaries[i] = cached
+			else:
+				prompts[f'ch-{i}'] = build()
+				keys[f'ch-{i}'] = key
+				indices[f'ch-{i}'] = i
+
+		if not prompts:
+			return summaries
+
+		results = self._call_batch(prompts)
+		for custom_id, prompt in prompts.items():
+			text = results.get(custom_id)
+			if text is None:
+				text = self._call_with_retry(prompt)
+			summaries[indices[custom_id]] = text
+			if self.cache is not None and text:
+				self.cache.put(keys[custom_id], text, self.model)
+		return summaries
+
+	def _chapter_request(
+		self, content: str, title: str, language: str
+	) -> Tuple[str, Callable[[], str]]:
+		"""
+		Build the cache-key prompt for a chapter and a builder for the prompt to send.
+
+		The key uses the full content, so a cache hit is found without truncating
+		(and counting tokens in) long chapters.
+		"""
+		return (
+			self._chapter_prompt(content, title, language, truncate=False),
+			partial(self._chapter_prompt, content, title, language),
+		)
+
+	def _chapter_prompt(
+		self, content: str, title: str, language: str, truncate: bool = True
+	) -> str:
+		"""Build the prompt for a single chapter summary."""
+		if truncate:
+			content = self._truncate_content(content)
+
+		lang_instruction = self._get_language_instruction(language)
+		return _prompt(
+			CHAPTER_INSTRUCTIONS.substitute(lang_instruction=lang_instruction),
+			CHAPTER_BODY.substitute(title=title, content=content),
+		)
 
 	def summarize_book(
 		self, chapter_summaries: str, book_title: str, language: str = 'zh-TW'
@@ -80,24 +644,24 @@ class BaseSummarizer(ABC):
 		if not chapter_summaries or not chapter_summaries.strip():
 			return ''
 
-		lang_instruction = self._get_language_instruction(language)
-		prompt = f"""請根據以下各章節摘要，為整本書撰寫綜合摘要。
-
-書名：{book_title}
-
-要求：
-- {lang_instruction}
-- 摘要長度約 500-800 字
-- 綜合全書的主旨、核心論點和結論
-- 呈現書籍的整體架構和邏輯脈絡
-- 保持客觀、學術的風格
+		return self._call_cached(self._book_prompt(chapter_summaries, book_title, language))
 
-各章節摘要：
-{chapter_summaries}
+	async def asummarize_book(
+		self, chapter_summaries: str, book_title: str, language: str = 'zh-TW'
+	) -> str:
+		"""Async variant of summarize_book."""
+		if not chapter_summaries or not chapter_summaries.strip():
+			return ''
 
-請直接輸出全書摘要內容，不需要任何前綴或標題。"""
+		return await self._acall_cached(self._book_prompt(chapter_summaries, book_title, language))
 
-		return self._call_api(prompt)
+	def _book_prompt(self, chapter_summaries: str, book_title: str, language: str) -> str:
+		"""Build the prompt for a book summary from chapter summaries."""
+		lang_instruction = self._get_language_instruction(language)
+		return _prompt(
+			BOOK_INSTRUCTIONS.substitute(lang_instruction=lang_instruction),
+			BOOK_BODY.substitute(book_title=book_title, chapter_summaries=chapter_summaries),
+		)
 
 	def refine_summary(
 		self,
@@ -127,49 +691,178 @@ class BaseSummarizer(ABC):
 		if not new_content or not new_content.strip():
 			return existing_summary
 
-		new_content = self._truncate_content(new_content, max_chars=200000)
-		lang_instruction = self._get_language_instruction(language)
-
-		if not existing_summary:
-			prompt = f"""請為以下書籍的第一個章節撰寫初始摘要。
+		condensed, state = self._condensed_summary(existing_summary, book_title, language)
+		refined = self._call_cached(
+			*self._refine_request(
+				condensed,
+				new_content,
+				new_title,
+				book_title,
+				chapter_index,
+				total_chapters,
+				language,
+			)
+		)
+		self._remember_compressed(refined, state)
+		return refined
 
-書名：{book_title}
-章節 {chapter_index}/{total_chapters}：{new_title}
+	async def arefine_summary(
+		self,
+		existing_summary: str,
+		new_content: str,
+		new_title: str,
+		book_title: str,
+		chapter_index: int,
+		total_chapters: int,
+		language: str = 'zh-TW',
+	) -> str:
+		"""Async variant of refine_summary."""
+		if not new_content or not new_content.strip():
+			return existing_summary
 
-要求：
-- {lang_instruction}
-- 摘要長度約 200-400 字
-- 抓取章節的核心概念和重點
-- 這是全書摘要的起點，後續會逐章精煉
+		condensed, state = await self._acondensed_summary(existing_summary, book_title, language)
+		refined = await self._acall_cached(
+			*self._refine_request(
+				condensed,
+				new_content,
+				new_title,
+				book_title,
+				chapter_index,
+				total_chapters,
+				language,
+			)
+		)
+		self._remember_compressed(refined, state)
+		return refined
 
-章節內容：
-{new_content}
+	def _refine_request(self, *args) -> Tuple[str, Callable[[], str]]:
+		"""
+		Build the cache-key prompt for a refine pass and a builder for the prompt to send.
 
-請直接輸出摘要內容，不需要任何前綴或標題。"""
-		else:
-			prompt = f"""請根據新的章節內容，精煉並擴充現有的書籍摘要。
+		Args:
+			*args: Positional arguments of _refine_prompt.
+		"""
+		return self._refine_prompt(*args, truncate=False), partial(self._refine_prompt, *args)
 
-書名：{book_title}
-目前進度：章節 {chapter_index}/{total_chapters}
-新章節標題：{new_title}
+	def _refine_prompt(
+		self,
+		existing_summary: str,
+		new_content: str,
+		new_title: str,
+		book_title: str,
+		chapter_index: int,
+		total_chapters: int,
+		language: str,
+		truncate: bool = True,
+	) -> str:
+		"""Build the prompt for the initial or a refining chapter pass."""
+		if truncate:
+			new_content = self._truncate_content(
+				new_content, max_tokens=self.MAX_CONTENT_TOKENS * 2 // 3
+			)
+		lang_instruction = self._get_language_instruction(language)
 
-現有摘要：
-{existing_summary}
+		if not existing_summary:
+			return _prompt(
+				REFINE_INITIAL_INSTRUCTIONS.substitute(lang_instruction=lang_instruction),
+				REFINE_INITIAL_BODY.substitute(
+					book_title=book_title,
+					chapter_index=chapter_index,
+					total_chapters=total_chapters,
+					new_title=new_title,
+					new_content=new_content,
+				),
+			)
 
-新章節內容：
-{new_content}
+		return _prompt(
+			REFINE_INSTRUCTIONS.substitute(lang_instruction=lang_instruction),
+			REFINE_BODY.substitute(
+				book_title=book_title,
+				chapter_index=chapter_index,
+				total_chapters=total_chapters,
+				suggested_length=min(300 + chapter_index * 50, 800),
+				new_title=new_title,
+				existing_summary=existing_summary,
+				new_content=new_content,
+			),
+		)
 
-要求：
-- {lang_instruction}
-- 將新章節的重點整合到現有摘要中
-- 保持摘要的連貫性和邏輯流暢
-- 摘要長度可隨內容增加適度擴展（目前建議 {min(300 + chapter_index * 50, 800)} 字左右）
-- 避免重複，突出新增的核心概念
-- 保持客觀、學術的風格
+	def _condensed_summary(
+		self, existing_summary: str, book_title: str, language: str
+	) -> Tuple[str, Optional[Tuple[str, int]]]:
+		"""
+		Bound the running summary sent with a refine pass.
 
-請直接輸出精煉後的完整摘要，不需要任何前綴或標題。"""
+		Summaries within REFINE_SUMMARY_TOKENS are sent as they are. Longer ones are
+		sent as a compressed bullet list followed by their last REFINE_TAIL_TOKENS
+		tokens, so the cost of each refine call stays roughly constant. The list is
+		looked up by the summary itself, so concurrent refine runs on one
+		summarizer never see each other's summaries.
 
-		return self._call_api(prompt)
+		Returns:
+			Tuple of (summary text to send, compression state to pass to
+			_remember_compressed, or None if the summary was sent as it is).
+		"""
+		if self._within_refine_budget(existing_summary):
+			return existing_summary, None
+		compressed, passes = self._compressed_state(existing_summary)
+		if compressed is None:
+			compressed = self._call_cached(
+				self._compress_prompt(existing_summary, book_title, language)
+			)
+		return self._with_tail(compressed, existing_summary), (compressed, passes)
+
+	async def _acondensed_summary(
+		self, existing_summary: str, book_title: str, language: str
+	) -> Tuple[str, Optional[Tuple[str, int]]]:
+		"""Async variant of _condensed_summary."""
+		if await asyncio.to_thread(self._within_refine_budget, existing_summary):
+			return existing_summary, None
+		compressed, passes = self._compressed_state(existing_summary)
+		if compressed is None:
+			compressed = await self._acall_cached(
+				self._compress_prompt(existing_summary, book_title, language)
+			)
+		condensed = await asyncio.to_thread(self._with_tail, compressed, existing_summary)
+		return condensed, (compressed, passes)
+
+	def _within_refine_budget(self, summary: str) -> bool:
+		"""Check whether a running summary can be sent without compressing it."""
+		# Same cheap upper bound as _truncate_content before counting
+		if len(summary) * 2 <= self.REFINE_SUMMARY_TOKENS:
+			return True
+		return self._count_tokens(summary) <= self.REFINE_SUMMARY_TOKENS
+
+	def _compressed_state(self, summary: str) -> Tuple[Optional[str], int]:
+		"""Get the compressed form a summary was refined from and the passes since."""
+		with self._compressed_lock:
+			state = self._compressed.pop(summary, None)
+		return state if state else (None, 0)
+
+	def _remember_compressed(self, refined: str, state: Optional[Tuple[str, int]]) -> None:
+		"""Keep the compressed form for the next pass unless it is due to be rebuilt."""
+		if state is None:
+			return
+		compressed, passes = state
+		if passes + 1 >= self.REFINE_COMPRESS_EVERY:
+			return
+		with self._compressed_lock:
+			self._compressed[refined] = (compressed, passes + 1)
+			if len(self._compressed) > self.COMPRESSED_CACHE_SIZE:
+				self._compressed.popitem(last=False)
+
+	def _with_tail(self, compressed: str, existing_summary: str) -> str:
+		"""Append the most recent raw text of the summary to its compressed form."""
+		tail = self._tail_to_tokens(existing_summary, self.REFINE_TAIL_TOKENS)
+		return f'{compressed}\n\n……{tail}'
+
+	def _compress_prompt(self, existing_summary: str, book_title: str, language: str) -> str:
+		"""Build the prompt that compresses the running summary into bullets."""
+		lang_instruction = self._get_language_instruction(language)
+		return _prompt(
+			COMPRESS_INSTRUCTIONS.substitute(lang_instruction=lang_instruction),
+			COMPRESS_BODY.substitute(book_title=book_title, existing_summary=existing_summary),
+		)
 
 	def finalize_refined_summary(
 		self,
@@ -188,30 +881,138 @@ class BaseSummarizer(ABC):
 		Returns:
 			Final polished summary.
 		"""
-		lang_instruction = self._get_language_instruction(language)
-		prompt = f"""請將以下逐章精煉的書籍摘要進行最終整理和潤飾。
+		return self._call_cached(self._finalize_prompt(refined_summary, book_title, language))
 
-書名：{book_title}
+	async def afinalize_refined_summary(
+		self,
+		refined_summary: str,
+		book_title: str,
+		language: str = 'zh-TW',
+	) -> str:
+		"""Async variant of finalize_refined_summary."""
+		return await self._acall_cached(
+			self._finalize_prompt(refined_summary, book_title, language)
+		)
 
-逐章精煉摘要：
-{refined_summary}
+	async def asummarize_and_refine(
+		self, chapters: List[Tuple[str, str]], book_title: str, language: str = 'zh-TW'
+	) -> Tuple[str, List[str]]:
+		"""
+		Summarize chapters concurrently while refining the book summary in order.
 
-要求：
-- {lang_instruction}
-- 確保結構完整、邏輯清晰
-- 摘要長度約 500-800 字
-- 涵蓋全書的主旨、核心論點、主要方法和結論
-- 保持客觀、學術的風格
-- 適當分段以提高可讀性
+		Chapter summaries are independent, so they run in parallel (bounded by
+		max_concurrency). The refine chain is sequential, so each summary joins it
+		as soon as it and all earlier summaries are ready. Summaries start at most
+		max_concurrency - 1 chapters ahead of the refine chain, which leaves a
+		concurrency slot free for its calls instead of queueing them behind the
+		rest of the book.
 
-請直接輸出最終摘要，不需要任何前綴或標題。"""
+		Args:
+			chapters: List of (content, title) pairs in reading order.
+			book_title: Title of the book.
+			language: Output language.
+
+		Returns:
+			Tuple of (refined_summary, chapter_summaries).
+		"""
+		total = len(chapters)
+		queue: asyncio.Queue = asyncio.Queue()
+		# Released as the refine chain takes each summary; waiters start in chapter order
+		ahead = asyncio.Semaphore(max(1, self.max_concurrency - 1))
+
+		async def produce(index: int, content: str, title: str) -> None:
+			await ahead.acquire()
+			try:
+				summary = await self.asummarize_chapter(content, title, language)
+			except Exception as e:
+				await queue.put((index, e))
+				return
+			await queue.put((index, summary))
+
+		async def consume() -> str:
+			refined = ''
+			pending: List[Tuple[int, object]] = []
+			next_index = 0
+			while next_index < total:
+				heapq.heappush(pending, await queue.get())
+				# Completions arrive out of order; refine only the contiguous prefix
+				while pending and pending[0][0] == next_index:
+					_, result = heapq.heappop(pending)
+					if isinstance(result, Exception):
+						raise result
+					ahead.release()
+					summaries[next_index] = result
+					refined = await self.arefine_summary(
+						existing_summary=refined,
+						new_content=result,
+						new_title=chapters[next_index][1],
+						book_title=book_title,
+						chapter_index=next_index + 1,
+						total_chapters=total,
+						language=language,
+					)
+					next_index += 1
+			return refined
+
+		summaries: List[str] = [''] * total
+		producers = [
+			asyncio.create_task(produce(i, content, title))
+			for i, (content, title) in enumerate(chapters)
+		]
+		try:
+			refined = await consume()
+		finally:
+			for task in producers:
+				task.cancel()
+			await asyncio.gather(*producers, return_exceptions=True)
 
-		return self._call_api(prompt)
+		return refined, summaries
 
-	def _truncate_content(self, content: str, max_chars: int = 300000) -> str:
-		"""Truncate content if too long."""
-		if len(content) > max_chars:
-			return content[:max_chars] + "\n\n[內容已截斷...]"
+	def _finalize_prompt(self, refined_summary: str, book_title: str, language: str) -> str:
+		"""Build the prompt for polishing the refined summary."""
+		lang_instruction = self._get_language_instruction(language)
+		return _prompt(
+			FINALIZE_INSTRUCTIONS.substitute(lang_instruction=lang_instruction),
+			FINALIZE_BODY.substitute(book_title=book_title, refined_summary=refined_summary),
+		)
+
+	def _truncate_content(self, content: str, max_tokens: Optional[int] = None) -> str:
+		"""Truncate content to fit the token budget (default: MAX_CONTENT_TOKENS)."""
+		max_tokens = max_tokens or self.MAX_CONTENT_TOKENS
+		# Cheap upper bound: tokenizers emit at most about two tokens per character
+		if len(content) * 2 <= max_tokens:
+			return content
+
+		truncated = self._truncate_to_tokens(content, max_tokens)
+		if len(truncated) < len(content):
+			return truncated + '\n\n[內容已截斷...]'
+		return content
+
+	def _count_tokens(self, content: str) -> int:
+		"""
+		Count tokens in content. Can be overridden with the provider's tokenizer.
+
+		The default estimate counts one token per non-ASCII character (CJK text)
+		and one per four ASCII characters.
+		"""
+		ascii_chars = len(content.encode('ascii', 'ignore'))
+		return (len(content) - ascii_chars) + ascii_chars // 4
+
+	def _truncate_to_tokens(self, content: str, max_tokens: int) -> str:
+		"""Trim content to at most max_tokens tokens."""
+		count = self._count_tokens(content)
+		while count > max_tokens:
+			content = content[: int(len(content) * max_tokens / count * 0.95)]
+			count = self._count_tokens(content)
+		return content
+
+	def _tail_to_tokens(self, content: str, max_tokens: int) -> str:
+		"""Keep at most the last max_tokens tokens of content."""
+		count = self._count_tokens(content)
+		while count > max_tokens:
+			keep = int(len(content) * max_tokens / count * 0.95)
+			content = content[len(content) - keep :]
+			count = self._count_tokens(content)
 		return content
 
 
@@ -219,12 +1020,17 @@ class ClaudeSummarizer(BaseSummarizer):
 	"""Claude API wrapper for text summarization."""
 
 	DEFAULT_MODEL = 'claude-haiku-4-5-20251001'
+	SUPPORTS_BATCH_API = True
+	MAX_CONTENT_TOKENS = 150000
 
 	def __init__(
 		self,
 		api_key: Optional[str] = None,
 		model: Optional[str] = None,
 		max_tokens: int = 2048,
+		max_concurrency: int = 8,
+		max_retries: int = 5,
+		cache: Optional[SummaryCache] = None,
 	):
 		"""
 		Initialize Claude summarizer.
@@ -233,31 +1039,101 @@ class ClaudeSummarizer(BaseSummarizer):
 			api_key: Anthropic API key. Defaults to ANTHROPIC_API_KEY env var.
 			model: Model to use. Defaults to claude-haiku-4-5-20251001.
 			max_tokens: Maximum tokens for response.
+			max_concurrency: Maximum number of concurrent async API calls.
+			max_retries: Maximum retries per API call on rate limit errors.
+			cache: Optional response cache shared across runs.
 		"""
-		super().__init__(max_tokens)
+		super().__init__(max_tokens, max_concurrency, max_retries, cache)
 		self.api_key = api_key or os.environ.get('ANTHROPIC_API_KEY')
 		if not self.api_key:
 			raise ValueError(
-				"API key required. Set ANTHROPIC_API_KEY environment variable "
-				"or pass api_key parameter."
+				'API key required. Set ANTHROPIC_API_KEY environment variable '
+				'or pass api_key parameter.'
 			)
 
-		self.client = anthropic.Anthropic(api_key=self.api_key)
 		self.model = model or self.DEFAULT_MODEL
 
+	@cached_property
+	def client(self) -> anthropic.Anthropic:
+		"""Sync Anthropic client, created on first use."""
+		return anthropic.Anthropic(api_key=self.api_key)
+
+	def _create_aclient(self) -> anthropic.AsyncAnthropic:
+		"""Create an async Anthropic client."""
+		return anthropic.AsyncAnthropic(
+			api_key=self.api_key, http_client=self._http_client(anthropic)
+		)
+
+	def _request_params(self, prompt: str) -> dict:
+		"""Build messages.create parameters for a prompt."""
+		return {
+			'model': self.model,
+			'max_tokens': self.max_tokens,
+			'messages': [{'role': 'user', 'content': prompt}],
+		}
+
 	def _call_api(self, prompt: str) -> str:
 		"""Make API call to Claude."""
+		return ''.join(self._call_api_stream(prompt))
+
+	async def _acall_api(self, prompt: str) -> str:
+		"""Make async API call to Claude."""
+		return ''.join([chunk async for chunk in self._acall_api_stream(prompt)])
+
+	def _call_api_stream(self, prompt: str) -> Iterator[str]:
+		"""Stream the Claude response as text chunks."""
+		try:
+			with self.client.messages.stream(**self._request_params(prompt)) as stream:
+				yield from stream.text_stream
+		except anthropic.APIError as e:
+			print(f'Claude API Error: {e}')
+			raise
+
+	async def _acall_api_stream(self, prompt: str) -> AsyncIterator[str]:
+		"""Async variant of _call_api_stream."""
 		try:
-			message = self.client.messages.create(
+			async with self.aclient.messages.stream(**self._request_params(prompt)) as stream:
+				async for text in stream.text_stream:
+					yield text
+		except anthropic.APIError as e:
+			print(f'Claude API Error: {e}')
+			raise
+
+	def _count_tokens(self, content: str) -> int:
+		"""Count tokens with the Claude token counting API."""
+		try:
+			result = self._with_retry(
+				self.client.messages.count_tokens,
 				model=self.model,
-				max_tokens=self.max_tokens,
-				messages=[
-					{'role': 'user', 'content': prompt}
-				],
+				messages=[{'role': 'user', 'content': content}],
+			)
+			return result.input_tokens
+		except anthropic.APIError as e:
+			print(f'Claude API Error during token counting: {e}')
+			return super()._count_tokens(content)
+
+	def _call_batch(self, prompts: Dict[str, str]) -> Dict[str, str]:
+		"""Submit prompts through the Claude Message Batches API."""
+		try:
+			batch = self.client.messages.batches.create(
+				requests=[
+					{'custom_id': custom_id, 'params': self._request_params(prompt)}
+					for custom_id, prompt in prompts.items()
+				]
 			)
-			return message.content[0].text
+			while batch.processing_status != 'ended':
+				time.sleep(self.BATCH_POLL_INTERVAL)
+				batch = self.client.messages.batches.retrieve(batch.id)
+
+			results = {}
+			for entry in self.client.messages.batches.results(batch.id):
+				if entry.result.type == 'succeeded':
+					results[entry.custom_id] = entry.result.message.content[0].text
+				else:
+					print(f'Claude batch request {entry.custom_id} {entry.result.type}')
+			return results
 		except anthropic.APIError as e:
-			print(f"Claude API Error: {e}")
+			print(f'Claude API Error: {e}')
 			raise
 
 
@@ -265,12 +1141,17 @@ class OpenAISummarizer(BaseSummarizer):
 	"""OpenAI API wrapper for text summarization."""
 
 	DEFAULT_MODEL = 'gpt-4o'
+	SUPPORTS_BATCH_API = True
+	BATCH_ENDPOINT = '/v1/chat/completions'
 
 	def __init__(
 		self,
 		api_key: Optional[str] = None,
 		model: Optional[str] = None,
 		max_tokens: int = 8192,
+		max_concurrency: int = 8,
+		max_retries: int = 5,
+		cache: Optional[SummaryCache] = None,
 	):
 		"""
 		Initialize OpenAI summarizer.
@@ -279,36 +1160,145 @@ class OpenAISummarizer(BaseSummarizer):
 			api_key: OpenAI API key. Defaults to OPENAI_API_KEY env var.
 			model: Model to use. Defaults to gpt-4o.
 			max_tokens: Maximum tokens for response.
+			max_concurrency: Maximum number of concurrent async API calls.
+			max_retries: Maximum retries per API call on rate limit errors.
+			cache: Optional response cache shared across runs.
 		"""
-		super().__init__(max_tokens)
+		super().__init__(max_tokens, max_concurrency, max_retries, cache)
 		self.api_key = api_key or os.environ.get('OPENAI_API_KEY')
 		if not self.api_key:
 			raise ValueError(
-				"API key required. Set OPENAI_API_KEY environment variable "
-				"or pass api_key parameter."
+				'API key required. Set OPENAI_API_KEY environment variable '
+				'or pass api_key parameter.'
 			)
 
-		self.client = openai.OpenAI(api_key=self.api_key)
 		self.model = model or self.DEFAULT_MODEL
 
+	@cached_property
+	def client(self) -> openai.OpenAI:
+		"""Sync OpenAI client, created on first use."""
+		return openai.OpenAI(api_key=self.api_key)
+
+	def _create_aclient(self) -> openai.AsyncOpenAI:
+		"""Create an async OpenAI client."""
+		return openai.AsyncOpenAI(api_key=self.api_key, http_client=self._http_client(openai))
+
+	def _request_params(self, prompt: str) -> dict:
+		"""Build chat.completions.create parameters for a prompt."""
+		params = {
+			'model': self.model,
+			'max_completion_tokens': self.max_tokens,
+			'messages': [{'role': 'user', 'content': prompt}],
+		}
+		# Only add reasoning_effort for GPT-5 models (reasoning models)
+		if 'gpt-5' in self.model or 'o1' in self.model or 'o3' in self.model:
+			params['reasoning_effort'] = 'minimal'
+		return params
+
 	def _call_api(self, prompt: str) -> str:
 		"""Make API call to OpenAI."""
+		return ''.join(self._call_api_stream(prompt))
+
+	async def _acall_api(self, prompt: str) -> str:
+		"""Make async API call to OpenAI."""
+		return ''.join([chunk async for chunk in self._acall_api_stream(prompt)])
+
+	def _call_api_stream(self, prompt: str) -> Iterator[str]:
+		"""Stream the OpenAI response as text chunks."""
 		try:
-			# Build request parameters
-			params = {
-				'model': self.model,
-				'max_completion_tokens': self.max_tokens,
-				'messages': [{'role': 'user', 'content': prompt}],
-			}
-			# Only add reasoning_effort for GPT-5 models (reasoning models)
-			if 'gpt-5' in self.model or 'o1' in self.model or 'o3' in self.model:
-				params['reasoning_effort'] = 'minimal'
-
-			response = self.client.chat.completions.create(**params)
-			content = response.choices[0].message.content
-			return content if content else ''
+			response = self.client.chat.completions.create(
+				**self._request_params(prompt), stream=True
+			)
+			for chunk in response:
+				if chunk.choices and chunk.choices[0].delta.content:
+					yield chunk.choices[0].delta.content
 		except openai.APIError as e:
-			print(f"OpenAI API Error: {e}")
+			print(f'OpenAI API Error: {e}')
+			raise
+
+	async def _acall_api_stream(self, prompt: str) -> AsyncIterator[str]:
+		"""Async variant of _call_api_stream."""
+		try:
+			response = await self.aclient.chat.completions.create(
+				**self._request_params(prompt), stream=True
+			)
+			async for chunk in response:
+				if chunk.choices and chunk.choices[0].delta.content:
+					yield chunk.choices[0].delta.content
+		except openai.APIError as e:
+			print(f'OpenAI API Error: {e}')
+			raise
+
+	@cached_property
+	def _encoding(self):
+		"""tiktoken encoding for the model, or None if it can't be loaded."""
+		if tiktoken is None:
+			return None
+		try:
+			try:
+				return tiktoken.encoding_for_model(self.model)
+			except KeyError:
+				return tiktoken.get_encoding('o200k_base')
+		except Exception as e:
+			# Encodings are downloaded on first use, which fails offline
+			print(f'tiktoken unavailable, estimating tokens instead: {e}')
+			return None
+
+	def _truncate_to_tokens(self, content: str, max_tokens: int) -> str:
+		"""Trim content on its tiktoken encoding, falling back to the estimate."""
+		if self._encoding is None:
+			return super()._truncate_to_tokens(content, max_tokens)
+		tokens = self._encoding.encode(content, disallowed_special=())
+		if len(tokens) <= max_tokens:
+			return content
+		return self._encoding.decode(tokens[:max_tokens])
+
+	def _call_batch(self, prompts: Dict[str, str]) -> Dict[str, str]:
+		"""Submit prompts through the OpenAI Batch API."""
+		lines = [
+			json.dumps(
+				{
+					'custom_id': custom_id,
+					'method': 'POST',
+					'url': self.BATCH_ENDPOINT,
+					'body': self._request_params(prompt),
+				},
+				ensure_ascii=False,
+			)
+			for custom_id, prompt in prompts.items()
+		]
+		try:
+			input_file = self.client.files.create(
+				file=('batch.jsonl', '\n'.join(lines).encode('utf-8')),
+				purpose='batch',
+			)
+			batch = self.client.batches.create(
+				input_file_id=input_file.id,
+				endpoint=self.BATCH_ENDPOINT,
+				completion_window='24h',
+			)
+			while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+				time.sleep(self.BATCH_POLL_INTERVAL)
+				batch = self.client.batches.retrieve(batch.id)
+
+			if batch.status != 'completed' or not batch.output_file_id:
+				raise RuntimeError(f'OpenAI batch {batch.id} {batch.status}')
+
+			results = {}
+			output = self.client.files.content(batch.output_file_id).text
+			for line in output.splitlines():
+				if not line.strip():
+					continue
+				entry = json.loads(line)
+				response = entry.get('response') or {}
+				if response.get('status_code') == 200:
+					content = response['body']['choices'][0]['message']['content']
+					results[entry['custom_id']] = content if content else ''
+				else:
+					print(f'OpenAI batch request {entry["custom_id"]} failed: {entry.get("error")}')
+			return results
+		except openai.APIError as e:
+			print(f'OpenAI API Error: {e}')
 			raise
 
 
@@ -317,12 +1307,21 @@ class OllamaSummarizer(BaseSummarizer):
 
 	DEFAULT_MODEL = 'gpt-oss:20b'
 	DEFAULT_BASE_URL = 'http://localhost:11434/v1'
+	NUM_CTX = 64000
+	NUM_PREDICT = 2048
+	MAX_CONTENT_TOKENS = 48000  # leave room in NUM_CTX for instructions and output
+	# Share of off-target script (CJK characters vs. Latin words) that triggers re-conversion
+	CONVERSION_THRESHOLD = 0.3
+	HTTP_TIMEOUT = 600.0  # local models can take minutes on long chapters
 
 	def __init__(
 		self,
 		model: Optional[str] = None,
 		base_url: Optional[str] = None,
 		max_tokens: int = 4096,
+		max_concurrency: int = 8,
+		max_retries: int = 5,
+		cache: Optional[SummaryCache] = None,
 	):
 		"""
 		Initialize Ollama summarizer.
@@ -331,23 +1330,42 @@ class OllamaSummarizer(BaseSummarizer):
 			model: Model to use. Defaults to gpt-oss:20b.
 			base_url: Ollama API base URL. Defaults to http://localhost:11434/v1.
 			max_tokens: Maximum tokens for response.
+			max_concurrency: Maximum number of concurrent async API calls.
+			max_retries: Maximum retries per API call on rate limit errors.
+			cache: Optional response cache shared across runs.
 		"""
-		super().__init__(max_tokens)
+		super().__init__(max_tokens, max_concurrency, max_retries, cache)
 		self.base_url = base_url or os.environ.get('OLLAMA_BASE_URL', self.DEFAULT_BASE_URL)
 		self.model = model or self.DEFAULT_MODEL
-		self._language = 'zh-TW(繁體中文/正體中文)'  # Default language, updated by high-level methods
+		self._language = (
+			'zh-TW(繁體中文/正體中文)'  # Default language, updated by high-level methods
+		)
 
-		# Ollama uses OpenAI-compatible API
-		self.client = openai.OpenAI(
+	@cached_property
+	def client(self) -> openai.OpenAI:
+		"""Sync client for Ollama's OpenAI-compatible API, created on first use."""
+		return openai.OpenAI(
 			base_url=self.base_url,
 			api_key='ollama',  # Ollama doesn't require API key but openai lib needs one
 		)
 
-	def _get_language_instruction(self, language: str) -> str:
+	def _create_aclient(self) -> openai.AsyncOpenAI:
+		"""Create an async client for Ollama's OpenAI-compatible API."""
+		return openai.AsyncOpenAI(
+			base_url=self.base_url,
+			api_key='ollama',
+			http_client=self._http_client(openai),
+		)
+
+	@staticmethod
+	@lru_cache(maxsize=8)
+	def _get_language_instruction(language: str) -> str:
 		"""Get stronger language instruction for Ollama models."""
 		return f'不論原始文本使用哪種語言，請務必以{language}撰寫輸出，禁止以其他語言為主體'
 
-	def _expand_language(self, language: str) -> str:
+	@staticmethod
+	@lru_cache(maxsize=8)
+	def _expand_language(language: str) -> str:
 		"""Expand language code to more descriptive form for better LLM understanding."""
 		if language == 'zh-TW':
 			return 'zh-TW(繁體中文/正體中文)'
@@ -358,6 +1376,26 @@ class OllamaSummarizer(BaseSummarizer):
 		self._language = self._expand_language(language)
 		return super().summarize_chapter(content, title, language)
 
+	async def asummarize_chapter(self, content: str, title: str, language: str = 'zh-TW') -> str:
+		"""Override to track current language."""
+		self._language = self._expand_language(language)
+		return await super().asummarize_chapter(content, title, language)
+
+	def summarize_chapter_stream(
+		self, content: str, title: str, language: str = 'zh-TW'
+	) -> Iterator[str]:
+		"""Override to track current language."""
+		self._language = self._expand_language(language)
+		yield from super().summarize_chapter_stream(content, title, language)
+
+	async def asummarize_chapter_stream(
+		self, content: str, title: str, language: str = 'zh-TW'
+	) -> AsyncIterator[str]:
+		"""Override to track current language."""
+		self._language = self._expand_language(language)
+		async for chunk in super().asummarize_chapter_stream(content, title, language):
+			yield chunk
+
 	def summarize_book(
 		self, chapter_summaries: str, book_title: str, language: str = 'zh-TW'
 	) -> str:
@@ -365,6 +1403,13 @@ class OllamaSummarizer(BaseSummarizer):
 		self._language = self._expand_language(language)
 		return super().summarize_book(chapter_summaries, book_title, language)
 
+	async def asummarize_book(
+		self, chapter_summaries: str, book_title: str, language: str = 'zh-TW'
+	) -> str:
+		"""Override to track current language."""
+		self._language = self._expand_language(language)
+		return await super().asummarize_book(chapter_summaries, book_title, language)
+
 	def refine_summary(
 		self,
 		existing_summary: str,
@@ -387,6 +1432,28 @@ class OllamaSummarizer(BaseSummarizer):
 			language=language,
 		)
 
+	async def arefine_summary(
+		self,
+		existing_summary: str,
+		new_content: str,
+		new_title: str,
+		book_title: str,
+		chapter_index: int,
+		total_chapters: int,
+		language: str = 'zh-TW',
+	) -> str:
+		"""Override to track current language."""
+		self._language = self._expand_language(language)
+		return await super().arefine_summary(
+			existing_summary=existing_summary,
+			new_content=new_content,
+			new_title=new_title,
+			book_title=book_title,
+			chapter_index=chapter_index,
+			total_chapters=total_chapters,
+			language=language,
+		)
+
 	def finalize_refined_summary(
 		self,
 		refined_summary: str,
@@ -397,30 +1464,120 @@ class OllamaSummarizer(BaseSummarizer):
 		self._language = self._expand_language(language)
 		return super().finalize_refined_summary(refined_summary, book_title, language)
 
+	async def afinalize_refined_summary(
+		self,
+		refined_summary: str,
+		book_title: str,
+		language: str = 'zh-TW',
+	) -> str:
+		"""Override to track current language."""
+		self._language = self._expand_language(language)
+		return await super().afinalize_refined_summary(refined_summary, book_title, language)
+
+	def _request_params(self, text: str, num_predict: Optional[int] = None) -> dict:
+		"""Build chat.completions.create parameters for a prompt text."""
+		return {
+			'model': self.model,
+			'max_completion_tokens': self.max_tokens,
+			'messages': [
+				{
+					'role': 'system',
+					'content': (
+						f'你是書籍摘要助理。必須只使用{self._language}輸出，不得混入其他語言。'
+					),
+				},
+				{'role': 'user', 'content': text},
+			],
+			'extra_body': {
+				'options': {
+					'num_ctx': self.NUM_CTX,
+					'num_predict': num_predict or self.NUM_PREDICT,
+				}
+			},
+		}
+
+	def _with_reminder(self, prompt: str) -> str:
+		"""Add language reminder at the end of the prompt."""
+		return prompt + f'\n\n【重要提醒】請確保輸出完全使用{self._language}，禁止使用其他語言。'
+
+	def _conversion_prompt(self, text: str) -> str:
+		"""Build the prompt that converts text to the target language."""
+		return f"""這是一段書籍摘要文本，請執行以下轉換：
+1. 將非{self._language}的文字轉換為{self._language}
+2. 已經是{self._language}的部分保持不變
+
+直接輸出轉換結果，不要加任何說明：
+
+{text}"""
+
+	def _needs_conversion(self, text: str) -> bool:
+		"""Check locally whether text drifted away from the target language."""
+		language = self._language
+		target_is_cjk = language.lower().startswith(('zh', 'ja')) or any(
+			'\u4e00' <= ch <= '\u9fff' for ch in language
+		)
+		target_is_traditional = any(
+			marker in language for marker in ('TW', 'HK', 'Hant', '繁體', '正體')
+		)
+
+		# Compare CJK characters against Latin words, which carry similar content
+		cjk = latin = simplified = 0
+		in_word = False
+		for ch in text:
+			is_letter = ch.isascii() and ch.isalpha()
+			if is_letter and not in_word:
+				latin += 1
+			in_word = is_letter
+			if '\u4e00' <= ch <= '\u9fff':
+				cjk += 1
+				if ch in SIMPLIFIED_ONLY_CHARS:
+					simplified += 1
+
+		if cjk + latin == 0:
+			return False
+		if target_is_cjk:
+			if target_is_traditional and simplified * 100 > cjk:
+				return True
+			return latin / (cjk + latin) > self.CONVERSION_THRESHOLD
+		return cjk / (cjk + latin) > self.CONVERSION_THRESHOLD
+
+	def _conversion_num_predict(self, text: str) -> int:
+		"""Bound conversion output to a multiple of the input size."""
+		# Headroom covers script expansion and reasoning tokens on thinking models
+		return min(self.NUM_PREDICT, 3 * self._count_tokens(text) + 512)
+
 	def _call_api(self, prompt: str) -> str:
 		"""Make API call to Ollama with language reinforcement and post-processing."""
-		# Add language reminder at the end of the prompt
-		prompt_with_reminder = prompt + f'\n\n【重要提醒】請確保輸出完全使用{self._language}，禁止使用其他語言。'
-
 		try:
 			response = self.client.chat.completions.create(
-				model=self.model,
-				max_completion_tokens=self.max_tokens,
-				messages=[{'role': 'user', 'content': prompt_with_reminder}],
-				extra_body={
-					'options': {
-						'num_ctx': 64000,
-						'num_predict': 2048,
-					}
-				},
+				**self._request_params(self._with_reminder(prompt))
+			)
+			content = response.choices[0].message.content
+			result = content if content else ''
+
+			# Post-process: convert only if the output drifted from the target language
+			if self._needs_conversion(result):
+				return self._convert_to_target_language(result)
+			return result
+		except openai.APIError as e:
+			print(f'Ollama API Error: {e}')
+			raise
+
+	async def _acall_api(self, prompt: str) -> str:
+		"""Make async API call to Ollama with language reinforcement and post-processing."""
+		try:
+			response = await self.aclient.chat.completions.create(
+				**self._request_params(self._with_reminder(prompt))
 			)
 			content = response.choices[0].message.content
 			result = content if content else ''
 
-			# Post-process: convert to target language
-			return self._convert_to_target_language(result)
+			# Post-process: convert only if the output drifted from the target language
+			if self._needs_conversion(result):
+				return await self._aconvert_to_target_language(result)
+			return result
 		except openai.APIError as e:
-			print(f"Ollama API Error: {e}")
+			print(f'Ollama API Error: {e}')
 			raise
 
 	def _convert_to_target_language(self, text: str) -> str:
@@ -428,30 +1585,33 @@ class OllamaSummarizer(BaseSummarizer):
 		if not text or not text.strip():
 			return text
 
-		conversion_prompt = f"""這是一段書籍摘要文本，請執行以下轉換：
-1. 將非{self._language}的文字轉換為{self._language}
-2. 已經是{self._language}的部分保持不變
-
-直接輸出轉換結果，不要加任何說明：
+		try:
+			response = self.client.chat.completions.create(
+				**self._request_params(
+					self._conversion_prompt(text), self._conversion_num_predict(text)
+				)
+			)
+			content = response.choices[0].message.content
+			return content if content else text
+		except openai.APIError as e:
+			print(f'Ollama API Error during conversion: {e}')
+			return text  # Return original text if conversion fails
 
-{text}"""
+	async def _aconvert_to_target_language(self, text: str) -> str:
+		"""Async variant of _convert_to_target_language."""
+		if not text or not text.strip():
+			return text
 
 		try:
-			response = self.client.chat.completions.create(
-				model=self.model,
-				max_completion_tokens=self.max_tokens,
-				messages=[{'role': 'user', 'content': conversion_prompt}],
-				extra_body={
-					'options': {
-						'num_ctx': 64000,
-						'num_predict': 2048,
-					}
-				},
+			response = await self.aclient.chat.completions.create(
+				**self._request_params(
+					self._conversion_prompt(text), self._conversion_num_predict(text)
+				)
 			)
 			content = response.choices[0].message.content
 			return content if content else text
 		except openai.APIError as e:
-			print(f"Ollama API Error during conversion: {e}")
+			print(f'Ollama API Error during conversion: {e}')
 			return text  # Return original text if conversion fails
 
 
@@ -459,6 +1619,9 @@ def _create_summarizer(
 	provider: str = 'claude',
 	api_key: Optional[str] = None,
 	model: Optional[str] = None,
+	max_concurrency: int = 8,
+	max_retries: int = 5,
+	cache: Optional[SummaryCache] = None,
 ) -> BaseSummarizer:
 	"""
 	Create a summarizer instance based on provider.
@@ -467,6 +1630,9 @@ def _create_summarizer(
 		provider: LLM provider ('claude' or 'openai').
 		api_key: API key for the provider.
 		model: Model to use.
+		max_concurrency: Maximum number of concurrent async API calls.
+		max_retries: Maximum retries per API call on rate limit errors.
+		cache: Optional response cache shared across runs.
 
 	Returns:
 		BaseSummarizer instance.
@@ -476,37 +1642,83 @@ def _create_summarizer(
 	"""
 	provider = provider.lower()
 	if provider == 'claude':
-		return ClaudeSummarizer(api_key=api_key, model=model)
+		return ClaudeSummarizer(
+			api_key=api_key,
+			model=model,
+			max_concurrency=max_concurrency,
+			max_retries=max_retries,
+			cache=cache,
+		)
 	elif provider == 'openai':
-		return OpenAISummarizer(api_key=api_key, model=model)
+		return OpenAISummarizer(
+			api_key=api_key,
+			model=model,
+			max_concurrency=max_concurrency,
+			max_retries=max_retries,
+			cache=cache,
+		)
 	elif provider == 'ollama':
-		return OllamaSummarizer(model=model)
+		return OllamaSummarizer(
+			model=model,
+			max_concurrency=max_concurrency,
+			max_retries=max_retries,
+			cache=cache,
+		)
 	else:
 		raise ValueError(
-			f"Unsupported provider: {provider}. "
-			"Supported providers: 'claude', 'openai', 'ollama'"
+			f"Unsupported provider: {provider}. Supported providers: 'claude', 'openai', 'ollama'"
 		)
 
 
-def create_summarizer_functions(
+def create_all_functions(
 	api_key: Optional[str] = None,
 	model: Optional[str] = None,
 	language: str = 'zh-TW',
 	provider: str = 'claude',
+	max_concurrency: int = 8,
+	max_retries: int = 5,
+	cache: Optional[SummaryCache] = None,
+	use_batch_api: bool = False,
+	summarizer: Optional[BaseSummarizer] = None,
 ):
 	"""
-	Factory function to create summarizer functions for EPUBSummarizer.
+	Factory function to create all EPUBSummarizer functions around one summarizer.
+
+	Sharing a single summarizer means the map-reduce and refine functions also
+	share one set of API clients and their connection pools.
 
 	Args:
 		api_key: API key for the provider.
 		model: Model to use.
 		language: Output language.
-		provider: LLM provider ('claude' or 'openai').
+		provider: LLM provider ('claude', 'openai', or 'ollama').
+		max_concurrency: Maximum number of concurrent async API calls.
+		max_retries: Maximum retries per API call on rate limit errors.
+		cache: Optional response cache shared across runs.
+		use_batch_api: Route the async chapters function through the provider's
+			batch API (Claude and OpenAI only).
+		summarizer: Existing summarizer to reuse. The provider options above are
+			ignored when given.
 
 	Returns:
-		Tuple of (chapter_summarizer_fn, book_summarizer_fn)
+		Tuple of (chapter_summarizer_fn, book_summarizer_fn, async_chapters_summarizer_fn,
+		refine_fn, finalize_fn).
+
+	Raises:
+		ValueError: If use_batch_api is set for a provider without batch support.
 	"""
-	summarizer = _create_summarizer(provider=provider, api_key=api_key, model=model)
+	if summarizer is None:
+		summarizer = _create_summarizer(
+			provider=provider,
+			api_key=api_key,
+			model=model,
+			max_concurrency=max_concurrency,
+			max_retries=max_retries,
+			cache=cache,
+		)
+
+	if use_batch_api and not summarizer.SUPPORTS_BATCH_API:
+		raise ValueError(f'{type(summarizer).__name__} does not support the batch API')
 
 	def chapter_fn(content: str, title: str) -> str:
 		return summarizer.summarize_chapter(content, title, language)
@@ -514,28 +1726,17 @@ def create_summarizer_functions(
 	def book_fn(chapter_summaries: str, book_title: str) -> str:
 		return summarizer.summarize_book(chapter_summaries, book_title, language)
 
-	return chapter_fn, book_fn
-
-
-def create_refine_functions(
-	api_key: Optional[str] = None,
-	model: Optional[str] = None,
-	language: str = 'zh-TW',
-	provider: str = 'claude',
-):
-	"""
-	Factory function to create refine strategy functions for EPUBSummarizer.
-
-	Args:
-		api_key: API key for the provider.
-		model: Model to use.
-		language: Output language.
-		provider: LLM provider ('claude' or 'openai').
-
-	Returns:
-		Tuple of (refine_fn, finalize_fn)
-	"""
-	summarizer = _create_summarizer(provider=provider, api_key=api_key, model=model)
+	async def achapters_fn(items: List[Tuple[str, str]]) -> List[str]:
+		if use_batch_api:
+			return await asyncio.to_thread(summarizer.summarize_chapters_batch, items, language)
+		# Callers run this under asyncio.run(); close the loop's client when done
+		async with summarizer:
+			return await asyncio.gather(
+				*[
+					summarizer.asummarize_chapter(content, title, language)
+					for content, title in items
+				]
+			)
 
 	def refine_fn(
 		existing_summary: str,
@@ -558,4 +1759,91 @@ def create_refine_functions(
 	def finalize_fn(refined_summary: str, book_title: str) -> str:
 		return summarizer.finalize_refined_summary(refined_summary, book_title, language)
 
+	return chapter_fn, book_fn, achapters_fn, refine_fn, finalize_fn
+
+
+def create_summarizer_functions(
+	api_key: Optional[str] = None,
+	model: Optional[str] = None,
+	language: str = 'zh-TW',
+	provider: str = 'claude',
+	max_concurrency: int = 8,
+	max_retries: int = 5,
+	cache: Optional[SummaryCache] = None,
+	use_batch_api: bool = False,
+	summarizer: Optional[BaseSummarizer] = None,
+):
+	"""
+	Factory function to create summarizer functions for EPUBSummarizer.
+
+	Args:
+		api_key: API key for the provider.
+		model: Model to use.
+		language: Output language.
+		provider: LLM provider ('claude', 'openai', or 'ollama').
+		max_concurrency: Maximum number of concurrent async API calls.
+		max_retries: Maximum retries per API call on rate limit errors.
+		cache: Optional response cache shared across runs.
+		use_batch_api: Route the async chapters function through the provider's
+			batch API (Claude and OpenAI only).
+		summarizer: Existing summarizer to reuse instead of creating a new one.
+
+	Returns:
+		Tuple of (chapter_summarizer_fn, book_summarizer_fn, async_chapters_summarizer_fn).
+		The async function takes a list of (content, title) pairs and summarizes
+		them concurrently.
+
+	Raises:
+		ValueError: If use_batch_api is set for a provider without batch support.
+	"""
+	chapter_fn, book_fn, achapters_fn, _, _ = create_all_functions(
+		api_key=api_key,
+		model=model,
+		language=language,
+		provider=provider,
+		max_concurrency=max_concurrency,
+		max_retries=max_retries,
+		cache=cache,
+		use_batch_api=use_batch_api,
+		summarizer=summarizer,
+	)
+	return chapter_fn, book_fn, achapters_fn
+
+
+def create_refine_functions(
+	api_key: Optional[str] = None,
+	model: Optional[str] = None,
+	language: str = 'zh-TW',
+	provider: str = 'claude',
+	max_concurrency: int = 8,
+	max_retries: int = 5,
+	cache: Optional[SummaryCache] = None,
+	summarizer: Optional[BaseSummarizer] = None,
+):
+	"""
+	Factory function to create refine strategy functions for EPUBSummarizer.
+
+	Args:
+		api_key: API key for the provider.
+		model: Model to use.
+		language: Output language.
+		provider: LLM provider ('claude', 'openai', or 'ollama').
+		max_concurrency: Maximum number of concurrent async API calls.
+		max_retries: Maximum retries per API call on rate limit errors.
+		cache: Optional response cache shared across runs.
+		summarizer: Existing summarizer to reuse instead of creating a new one.
+
+	Returns:
+		Tuple of (refine_fn, finalize_fn)
+	"""
+	_, _, _, refine_fn, finalize_fn = create_all_functions(
+		api_key=api_key,
+		model=model,
+		language=language,
+		provider=provider,
+		max_concurrency=max_concurrency,
+		max_retries=max_retries,
+		cache=cache,
+		summarizer=summarizer,
+	)
 	return refine_fn, finalize_fn
@@ -7,16 +7,90 @@ This module provides functionality to:
 3. Generate chapter and book summaries
 """
 
+import asyncio
+import hashlib
 import os
+import posixpath
+import queue
 import re
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass, field
-from typing import List, Optional
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from epub_utils import Document
 from epub_utils.navigation.base import NavigationItem
 
+# Characters not allowed in filenames, and runs of whitespace/underscores to collapse
+_INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+_WHITESPACE_RUN = re.compile(r'[\s_]+')
+_WORD = re.compile(r'\S+')
 
-@dataclass
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _nonempty(text: str) -> bool:
+	"""
+	Check whether text contains anything besides whitespace.
+
+	Unlike text.strip(), this never copies padded text, and it stops at the
+	first non-whitespace character, which for real chapter text is near the start.
+	"""
+	return bool(text) and not text.isspace()
+
+
+def _prefetch(items: Iterable, maxsize: int = 2) -> Iterator:
+	"""
+	Iterate over items while a background thread produces the next ones.
+
+	Args:
+		items: Iterable to consume on the background thread.
+		maxsize: Number of items to read ahead.
+
+	Yields:
+		The items, in order. An exception raised while producing is re-raised here.
+	"""
+	buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+	stop = threading.Event()
+
+	def put(entry) -> bool:
+		# Give up once the consumer is gone so the thread does not block forever
+		while not stop.is_set():
+			try:
+				buffer.put(entry, timeout=0.1)
+				return True
+			except queue.Full:
+				continue
+		return False
+
+	def produce() -> None:
+		try:
+			for item in items:
+				if not put((item, None)):
+					return
+		except Exception as e:
+			put((None, e))
+			return
+		put(None)  # end of stream
+
+	threading.Thread(target=produce, daemon=True).start()
+	try:
+		while True:
+			entry = buffer.get()
+			if entry is None:
+				return
+			item, error = entry
+			if error is not None:
+				raise error
+			yield item
+	finally:
+		stop.set()
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ChapterInfo:
 	"""Represents a chapter with its content and summary."""
 
@@ -28,7 +102,7 @@ class ChapterInfo:
 	children: List['ChapterInfo'] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class BookSummary:
 	"""Represents the complete book summary."""
 
@@ -52,6 +126,19 @@ class EPUBSummarizer:
 		self._nav_base_path = self._get_nav_base_path()
 		self._spine_hrefs = self._build_spine_hrefs()
 		self._href_to_spine_index = {href: i for i, href in enumerate(self._spine_hrefs)}
+		# Spine index per raw TOC target; each target is looked up as a start and an end
+		self._target_index_cache: Dict[str, int] = {}
+		# Plain text per archive path. Adjacent TOC entries often share a file and
+		# the document is read-only, so entries never need invalidating.
+		self._content_cache: Dict[str, str] = {}
+		self._content_loads: Dict[str, asyncio.Future] = {}
+		# Chapter tree from the last get_chapters() call and its flattened form
+		self._chapters: Optional[List[ChapterInfo]] = None
+		self._flat_cache: Optional[List[ChapterInfo]] = None
+		# Summary per (summarizer function, title and content digest). Boilerplate
+		# pages and split chapters repeat the same text, which only needs
+		# summarizing once per prompt.
+		self._summary_cache: Dict[Tuple[Callable, bytes], str] = {}
 
 	def _get_nav_base_path(self) -> str:
 		"""Get the base path for resolving navigation file relative paths."""
@@ -59,8 +146,8 @@ class EPUBSummarizer:
 		nav_href = self.doc.package.nav_href or self.doc.package.toc_href
 		if nav_href:
 			# Nav file is relative to package, get its directory
-			full_nav_path = os.path.join(self.package_href, nav_href)
-			return os.path.dirname(full_nav_path)
+			full_nav_path = posixpath.join(self.package_href, nav_href)
+			return posixpath.dirname(full_nav_path)
 		return self.package_href
 
 	def _build_spine_hrefs(self) -> List[str]:
@@ -71,8 +158,9 @@ class EPUBSummarizer:
 			idref = itemref['idref']
 			item = manifest.find_by_id(idref)
 			if item:
-				# Build full path relative to package
-				href = os.path.normpath(os.path.join(self.package_href, item['href']))
+				# Build full path relative to package. EPUB paths always use '/',
+				# so resolve them with posixpath on every platform.
+				href = posixpath.normpath(posixpath.join(self.package_href, item['href']))
 				spine_hrefs.append(href)
 		return spine_hrefs
 
@@ -80,10 +168,14 @@ class EPUBSummarizer:
 		"""Get spine index for a TOC target path."""
 		if not target:
 			return -1
-		# Remove fragment identifier
-		target_path = target.split('#')[0]
-		full_path = os.path.normpath(os.path.join(self._nav_base_path, target_path))
-		return self._href_to_spine_index.get(full_path, -1)
+		index = self._target_index_cache.get(target)
+		if index is None:
+			# Remove fragment identifier
+			target_path = target.split('#')[0]
+			full_path = posixpath.normpath(posixpath.join(self._nav_base_path, target_path))
+			index = self._href_to_spine_index.get(full_path, -1)
+			self._target_index_cache[target] = index
+		return index
 
 	def get_chapters(self) -> List[ChapterInfo]:
 		"""
@@ -97,36 +189,63 @@ class EPUBSummarizer:
 			return []
 
 		toc_items = toc.get_toc_items()
-		return self._convert_nav_items(toc_items)
+		self._chapters = self._convert_nav_items(toc_items)
+		self._flat_cache = None
+		return self._chapters
 
 	def _convert_nav_items(self, nav_items: List[NavigationItem]) -> List[ChapterInfo]:
-		"""Convert NavigationItems to ChapterInfo objects recursively."""
-		chapters = []
-
-		for item in nav_items:
-			chapter = ChapterInfo(
-				title=item.label,
-				target=item.target,
-				level=item.level,
-			)
-
-			# Recursively convert children
-			if item.children:
-				chapter.children = self._convert_nav_items(item.children)
-
-			chapters.append(chapter)
+		"""Convert NavigationItems to ChapterInfo objects, keeping the nesting."""
+		chapters: List[ChapterInfo] = []
+
+		# Walk the TOC with an explicit stack of (items, list to fill) pairs
+		stack = [(nav_items, chapters)]
+		while stack:
+			items, siblings = stack.pop()
+			for item in items:
+				chapter = ChapterInfo(
+					title=item.label,
+					target=item.target,
+					level=item.level,
+				)
+				if item.children:
+					stack.append((item.children, chapter.children))
+				siblings.append(chapter)
 
 		return chapters
 
 	def _load_single_file_content(self, full_path: str) -> str:
-		"""Load plain text content from a single file."""
+		"""Load plain text content from a single file, caching it per path."""
+		cached = self._content_cache.get(full_path)
+		if cached is not None:
+			return cached
+
 		try:
 			content = self.doc.get_file_by_path(full_path)
 			if hasattr(content, 'to_plain'):
-				return content.to_plain()
-			return str(content)
+				text = content.to_plain()
+			else:
+				text = str(content)
 		except Exception:
-			return ''
+			text = ''
+
+		self._content_cache[full_path] = text
+		return text
+
+	async def _aload_single_file_content(self, full_path: str) -> str:
+		"""Async variant of _load_single_file_content that shares in-flight reads."""
+		cached = self._content_cache.get(full_path)
+		if cached is not None:
+			return cached
+
+		# Chapters sharing a file are loaded at the same time; read it only once
+		load = self._content_loads.get(full_path)
+		if load is None:
+			load = asyncio.ensure_future(
+				asyncio.to_thread(self._load_single_file_content, full_path)
+			)
+			self._content_loads[full_path] = load
+			load.add_done_callback(lambda _: self._content_loads.pop(full_path, None))
+		return await load
 
 	def _load_spine_range_content(self, start_index: int, end_index: int) -> str:
 		"""
@@ -145,14 +264,74 @@ class EPUBSummarizer:
 		if end_index < 0:
 			end_index = len(self._spine_hrefs)
 
-		content_parts = []
-		for i in range(start_index, min(end_index, len(self._spine_hrefs))):
-			href = self._spine_hrefs[i]
-			text = self._load_single_file_content(href)
-			if text.strip():
-				content_parts.append(text)
+		texts = (
+			self._load_single_file_content(href)
+			for href in self._spine_hrefs[start_index:end_index]
+		)
+		return '\n\n'.join(text for text in texts if _nonempty(text))
 
-		return '\n\n'.join(content_parts)
+	async def _aload_spine_range_content(self, start_index: int, end_index: int) -> str:
+		"""Async variant of _load_spine_range_content that reads the files concurrently."""
+		if start_index < 0:
+			return ''
+
+		if end_index < 0:
+			end_index = len(self._spine_hrefs)
+
+		# Each read opens its own zip handle, so the files can be loaded in parallel
+		texts = await asyncio.gather(
+			*[
+				self._aload_single_file_content(href)
+				for href in self._spine_hrefs[start_index:end_index]
+			]
+		)
+		return '\n\n'.join(text for text in texts if _nonempty(text))
+
+	def _get_spine_range_for_chapter(
+		self, chapter: ChapterInfo, next_target: Optional[str] = None
+	) -> Tuple[int, int]:
+		"""
+		Get the spine range holding a chapter's content.
+
+		Returns:
+			(start_index, end_index) with end exclusive. start_index is -1 if the
+			chapter's target is not in the spine.
+		"""
+		start_index = self._get_spine_index_for_target(chapter.target)
+		if start_index < 0:
+			return -1, -1
+
+		# Determine end index
+		if next_target:
+			end_index = self._get_spine_index_for_target(next_target)
+			if end_index < 0:
+				end_index = start_index + 1
+		else:
+			end_index = start_index + 1
+
+		return start_index, end_index
+
+	def _get_spine_ranges(self, flat_chapters: List[ChapterInfo]) -> List[Tuple[int, int]]:
+		"""
+		Get the spine range of every chapter in reading order in one sweep.
+
+		Each target is resolved once and reused as the previous chapter's end,
+		matching _get_spine_range_for_chapter for each (chapter, next chapter) pair.
+		"""
+		starts = [self._get_spine_index_for_target(chapter.target) for chapter in flat_chapters]
+		ranges = []
+		for i, start_index in enumerate(starts):
+			if start_index < 0:
+				ranges.append((-1, -1))
+				continue
+			next_start = starts[i + 1] if i + 1 < len(starts) else -1
+			ranges.append((start_index, next_start if next_start >= 0 else start_index + 1))
+		return ranges
+
+	def _get_fallback_path(self, chapter: ChapterInfo) -> str:
+		"""Resolve a chapter target that is not in the spine to an archive path."""
+		target_path = chapter.target.split('#')[0]
+		return posixpath.normpath(posixpath.join(self._nav_base_path, target_path))
 
 	def load_chapter_content(self, chapter: ChapterInfo, next_target: Optional[str] = None) -> str:
 		"""
@@ -169,43 +348,55 @@ class EPUBSummarizer:
 		Returns:
 			Plain text content of the chapter.
 		"""
+		start_index, end_index = self._get_spine_range_for_chapter(chapter, next_target)
+		return self._load_chapter_range(chapter, start_index, end_index)
+
+	def _load_chapter_range(self, chapter: ChapterInfo, start_index: int, end_index: int) -> str:
+		"""Load a chapter's content from its resolved spine range."""
 		if not chapter.target:
 			return ''
 
-		start_index = self._get_spine_index_for_target(chapter.target)
 		if start_index < 0:
 			# Fallback: try loading single file directly
-			target_path = chapter.target.split('#')[0]
-			full_path = os.path.normpath(os.path.join(self._nav_base_path, target_path))
-			return self._load_single_file_content(full_path)
-
-		# Determine end index
-		if next_target:
-			end_index = self._get_spine_index_for_target(next_target)
-			if end_index < 0:
-				end_index = start_index + 1
-		else:
-			end_index = start_index + 1
+			return self._load_single_file_content(self._get_fallback_path(chapter))
 
 		# Load content from spine range
 		content = self._load_spine_range_content(start_index, end_index)
 
 		# If content is empty, try just the next spine item (for image-only targets)
-		if not content.strip() and start_index + 1 < len(self._spine_hrefs):
+		if not content and start_index + 1 < len(self._spine_hrefs):
 			if end_index <= start_index + 1:
 				end_index = start_index + 2
 			content = self._load_spine_range_content(start_index, end_index)
 
 		return content
 
-	def _flatten_chapters_with_targets(self, chapters: List[ChapterInfo]) -> List[tuple]:
-		"""Flatten chapters into a list of (chapter, target) tuples in order."""
-		result = []
-		for chapter in chapters:
-			result.append((chapter, chapter.target))
-			if chapter.children:
-				result.extend(self._flatten_chapters_with_targets(chapter.children))
-		return result
+	async def aload_chapter_content(
+		self, chapter: ChapterInfo, next_target: Optional[str] = None
+	) -> str:
+		"""Async variant of load_chapter_content."""
+		start_index, end_index = self._get_spine_range_for_chapter(chapter, next_target)
+		return await self._aload_chapter_range(chapter, start_index, end_index)
+
+	async def _aload_chapter_range(
+		self, chapter: ChapterInfo, start_index: int, end_index: int
+	) -> str:
+		"""Async variant of _load_chapter_range."""
+		if not chapter.target:
+			return ''
+
+		if start_index < 0:
+			return await self._aload_single_file_content(self._get_fallback_path(chapter))
+
+		content = await self._aload_spine_range_content(start_index, end_index)
+
+		# If content is empty, try just the next spine item (for image-only targets)
+		if not content and start_index + 1 < len(self._spine_hrefs):
+			if end_index <= start_index + 1:
+				end_index = start_index + 2
+			content = await self._aload_spine_range_content(start_index, end_index)
+
+		return content
 
 	def load_all_chapters(self, chapters: List[ChapterInfo]) -> None:
 		"""
@@ -217,22 +408,99 @@ class EPUBSummarizer:
 		Args:
 			chapters: List of ChapterInfo objects to populate with content.
 		"""
-		# Flatten all chapters to get ordered list of targets
-		flat_chapters = self._flatten_chapters_with_targets(chapters)
+		asyncio.run(self.aload_all_chapters(chapters))
+
+	async def aload_all_chapters(self, chapters: List[ChapterInfo]) -> None:
+		"""
+		Load content for all chapters, reading every chapter's spine range concurrently.
+
+		Args:
+			chapters: List of ChapterInfo objects to populate with content.
+		"""
+		flat_chapters = self._flatten_chapters(chapters)
+		ranges = self._get_spine_ranges(flat_chapters)
+		contents = await asyncio.gather(
+			*[
+				self._aload_chapter_range(chapter, start_index, end_index)
+				for chapter, (start_index, end_index) in zip(flat_chapters, ranges)
+			]
+		)
+		for chapter, content in zip(flat_chapters, contents):
+			chapter.content = content
+
+	def iter_chapter_content(
+		self, chapters: List[ChapterInfo], prefetch: int = 0
+	) -> Iterator[Tuple[ChapterInfo, str]]:
+		"""
+		Yield (chapter, content) pairs in reading order without storing the content.
 
-		# Load content for each chapter
-		for i, (chapter, target) in enumerate(flat_chapters):
-			# Get next chapter's target to know where to stop
-			next_target = flat_chapters[i + 1][1] if i + 1 < len(flat_chapters) else None
-			chapter.content = self.load_chapter_content(chapter, next_target)
+		Unlike load_all_chapters, only the chapter being yielded (and any file it
+		shares with the next one) is held in memory.
 
-	def summarize_chapter(self, chapter: ChapterInfo, summarizer_fn) -> str:
+		Args:
+			chapters: List of ChapterInfo objects to read.
+			prefetch: Number of chapters to load ahead on a background thread, so
+				loading overlaps with whatever the caller does with each chapter.
+
+		Yields:
+			Each flattened chapter with its plain text content.
+		"""
+		if prefetch > 0:
+			return _prefetch(self._iter_chapter_content(chapters), maxsize=prefetch)
+		return self._iter_chapter_content(chapters)
+
+	def _iter_chapter_content(
+		self, chapters: List[ChapterInfo]
+	) -> Iterator[Tuple[ChapterInfo, str]]:
+		"""Generator behind iter_chapter_content."""
+		flat_chapters = self._flatten_chapters(chapters)
+		ranges = self._get_spine_ranges(flat_chapters)
+		paths = [
+			self._get_chapter_paths(chapter, start_index, end_index)
+			for chapter, (start_index, end_index) in zip(flat_chapters, ranges)
+		]
+		for i, (chapter, (start_index, end_index)) in enumerate(zip(flat_chapters, ranges)):
+			content = self._load_chapter_range(chapter, start_index, end_index)
+			# Files this chapter read are not needed again unless the next one reads them
+			keep = paths[i + 1] if i + 1 < len(paths) else []
+			for path in paths[i]:
+				if path not in keep:
+					self._content_cache.pop(path, None)
+			yield chapter, content
+
+	def _get_chapter_paths(
+		self, chapter: ChapterInfo, start_index: int, end_index: int
+	) -> List[str]:
+		"""Archive paths _load_chapter_range may read for a chapter's spine range."""
+		if not chapter.target:
+			return []
+		if start_index < 0:
+			return [self._get_fallback_path(chapter)]
+		if end_index < 0:
+			end_index = len(self._spine_hrefs)
+		# Image-only targets also read the spine item after them
+		return self._spine_hrefs[start_index : max(end_index, start_index + 2)]
+
+	def _iter_loaded_chapters(
+		self, chapters: List[ChapterInfo]
+	) -> Iterator[Tuple[int, ChapterInfo]]:
+		"""Yield (1-based flat index, chapter) for chapters with content, loading on demand."""
+		chapter_contents = self.iter_chapter_content(chapters, prefetch=2)
+		for i, (chapter, content) in enumerate(chapter_contents, 1):
+			if content:
+				chapter.content = content
+				yield i, chapter
+
+	def summarize_chapter(
+		self, chapter: ChapterInfo, summarizer_fn, release_content: bool = False
+	) -> str:
 		"""
 		Generate summary for a single chapter.
 
 		Args:
 			chapter: ChapterInfo with content loaded.
 			summarizer_fn: Function that takes text and returns summary.
+			release_content: Clear chapter.content once the summary is made.
 
 		Returns:
 			Summary text.
@@ -240,34 +508,182 @@ class EPUBSummarizer:
 		if not chapter.content:
 			return ''
 
-		chapter.summary = summarizer_fn(chapter.content, chapter.title)
+		key = self._content_key(summarizer_fn, chapter.title, chapter.content)
+		summary = self._summary_cache.get(key)
+		if summary is None:
+			summary = summarizer_fn(chapter.content, chapter.title)
+		self._store_summary(key, [chapter], summary, release_content)
 		return chapter.summary
 
-	def summarize_all_chapters(self, chapters: List[ChapterInfo], summarizer_fn) -> None:
+	def _release_content_cache(self) -> None:
+		"""Drop cached file text so released chapter content can be freed."""
+		self._content_cache.clear()
+
+	@staticmethod
+	def _content_key(summarizer_fn: Callable, title: str, content: str) -> Tuple[Callable, bytes]:
+		"""
+		Key identifying a chapter's summary request in the summary cache.
+
+		The title is part of the prompt, and a different summarizer function may
+		use another model or language, so both are part of the key.
+		"""
+		digest = hashlib.blake2b(title.encode('utf-8'), digest_size=16)
+		digest.update(b'\0')
+		digest.update(content.encode('utf-8'))
+		return summarizer_fn, digest.digest()
+
+	def _group_by_content(
+		self, chapters: List[ChapterInfo], summarizer_fn: Callable, release_content: bool
+	) -> Dict[Tuple[Callable, bytes], List[ChapterInfo]]:
+		"""
+		Group chapters by title and content, filling in already-cached summaries.
+
+		Returns:
+			Chapters that still need a summary, keyed by their summary cache key.
+			Only the first chapter of each group has to be summarized.
+		"""
+		groups: Dict[Tuple[Callable, bytes], List[ChapterInfo]] = {}
+		for chapter in self._flatten_chapters(chapters):
+			if not chapter.content:
+				continue
+			key = self._content_key(summarizer_fn, chapter.title, chapter.content)
+			summary = self._summary_cache.get(key)
+			if summary is None:
+				groups.setdefault(key, []).append(chapter)
+			else:
+				self._store_summary(key, [chapter], summary, release_content)
+		return groups
+
+	def _store_summary(
+		self,
+		key: Tuple[Callable, bytes],
+		group: List[ChapterInfo],
+		summary: str,
+		release_content: bool,
+	) -> None:
+		"""Cache a summary and assign it to every chapter sharing its content."""
+		self._summary_cache[key] = summary
+		for chapter in group:
+			chapter.summary = summary
+			if release_content:
+				chapter.content = ''
+
+	def summarize_all_chapters(
+		self,
+		chapters: List[ChapterInfo],
+		summarizer_fn,
+		concurrency: int = 8,
+		release_content: bool = True,
+	) -> None:
 		"""
-		Generate summaries for all chapters recursively.
+		Generate summaries for all chapters using a thread pool.
 
 		Args:
 			chapters: List of ChapterInfo objects with content loaded.
 			summarizer_fn: Function that takes (content, title) and returns summary.
+				It is called from worker threads and must be thread-safe.
+			concurrency: Maximum number of chapters summarized at once.
+			release_content: Clear each chapter's content once it is summarized.
+		"""
+		groups = self._group_by_content(chapters, summarizer_fn, release_content)
+		if release_content:
+			self._release_content_cache()
+		with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+			futures = {
+				executor.submit(summarizer_fn, group[0].content, group[0].title): key
+				for key, group in groups.items()
+			}
+			for future in as_completed(futures):
+				key = futures[future]
+				self._store_summary(key, groups[key], future.result(), release_content)
+
+	def load_and_summarize_chapters(
+		self, chapters: List[ChapterInfo], summarizer_fn, concurrency: int = 8
+	) -> None:
 		"""
-		for chapter in chapters:
-			self.summarize_chapter(chapter, summarizer_fn)
+		Load and summarize chapters in one pass, without loading the whole book first.
 
-			# Recursively summarize children
-			if chapter.children:
-				self.summarize_all_chapters(chapter.children, summarizer_fn)
+		Chapters are read in order and handed to a thread pool. At most concurrency
+		chapters are in flight, so only their text is held in memory at a time.
+
+		Args:
+			chapters: List of ChapterInfo objects (content need not be loaded).
+			summarizer_fn: Function that takes (content, title) and returns summary.
+				It is called from worker threads and must be thread-safe.
+			concurrency: Maximum number of chapters summarized at once.
+		"""
+		concurrency = max(1, concurrency)
+		with ThreadPoolExecutor(max_workers=concurrency) as executor:
+			in_flight = {}
+			# Chapters waiting on each in-flight request, so duplicates are sent once
+			groups: Dict[Tuple[Callable, bytes], List[ChapterInfo]] = {}
+
+			def collect(futures) -> None:
+				for future in futures:
+					key = in_flight.pop(future)
+					self._store_summary(key, groups.pop(key), future.result(), False)
+
+			for chapter, content in self.iter_chapter_content(chapters, prefetch=2):
+				if not content:
+					continue
+				key = self._content_key(summarizer_fn, chapter.title, content)
+				if key in groups:
+					groups[key].append(chapter)
+					continue
+				summary = self._summary_cache.get(key)
+				if summary is not None:
+					chapter.summary = summary
+					continue
+				if len(in_flight) >= concurrency:
+					done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+					collect(done)
+				groups[key] = [chapter]
+				in_flight[executor.submit(summarizer_fn, content, chapter.title)] = key
+
+			collect(as_completed(list(in_flight)))
+
+	async def asummarize_all_chapters(
+		self, chapters: List[ChapterInfo], chapters_fn, release_content: bool = True
+	) -> None:
+		"""
+		Generate summaries for all chapters concurrently.
+
+		Args:
+			chapters: List of ChapterInfo objects with content loaded.
+			chapters_fn: Async function that takes a list of (content, title) pairs
+				and returns the summaries in the same order.
+			release_content: Clear each chapter's content once it is summarized.
+		"""
+		groups = self._group_by_content(chapters, chapters_fn, release_content)
+		if release_content:
+			self._release_content_cache()
+		summaries = await chapters_fn(
+			[(group[0].content, group[0].title) for group in groups.values()]
+		)
+		for (key, group), summary in zip(groups.items(), summaries):
+			self._store_summary(key, group, summary, release_content)
 
 	def generate_book_summary(
-		self, chapters: List[ChapterInfo], summarizer_fn, book_title: Optional[str] = None
+		self,
+		chapters: List[ChapterInfo],
+		summarizer_fn,
+		book_title: Optional[str] = None,
+		fanout: int = 8,
+		concurrency: int = 8,
 	) -> BookSummary:
 		"""
 		Generate a complete book summary from chapter summaries.
 
+		Books with more than fanout chapter summaries are reduced as a tree: groups
+		of fanout summaries are combined level by level until one call covers the
+		rest, so no single call has to take every chapter summary.
+
 		Args:
 			chapters: List of ChapterInfo with summaries.
 			summarizer_fn: Function that takes combined summaries and returns book summary.
 			book_title: Optional book title, defaults to metadata title.
+			fanout: Summaries combined per call. Values below 2 combine all at once.
+			concurrency: Maximum number of group summaries generated at once.
 
 		Returns:
 			BookSummary object with full summary.
@@ -278,10 +694,11 @@ class EPUBSummarizer:
 
 		# Collect all chapter summaries
 		all_summaries = self._collect_summaries(chapters)
-		combined_summaries = '\n\n'.join(all_summaries)
 
 		# Generate book summary
-		full_summary = summarizer_fn(combined_summaries, book_title)
+		full_summary = self._tree_reduce(
+			all_summaries, summarizer_fn, book_title, fanout, concurrency
+		)
 
 		return BookSummary(
 			title=book_title,
@@ -289,26 +706,82 @@ class EPUBSummarizer:
 			full_summary=full_summary,
 		)
 
-	def _collect_summaries(self, chapters: List[ChapterInfo]) -> List[str]:
-		"""Collect all chapter summaries recursively."""
-		summaries = []
+	@staticmethod
+	def _tree_reduce(
+		summaries: List[str], summarizer_fn, title: str, fanout: int = 8, concurrency: int = 8
+	) -> str:
+		"""
+		Combine summaries in groups of fanout, level by level, into one.
 
-		for chapter in chapters:
-			if chapter.summary:
-				summaries.append(f"## {chapter.title}\n{chapter.summary}")
+		Groups on the same level are independent and are summarized concurrently.
+		A leftover group of one summary is passed to the next level unchanged. The
+		final call always goes through summarizer_fn, even for a single summary.
 
-			if chapter.children:
-				summaries.extend(self._collect_summaries(chapter.children))
+		Returns:
+			The combined summary.
+		"""
+		if fanout < 2:
+			return summarizer_fn('\n\n'.join(summaries), title)
+
+		def combine(group: List[str]) -> str:
+			if len(group) == 1:
+				return group[0]
+			return summarizer_fn('\n\n'.join(group), title)
+
+		with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+			while len(summaries) > fanout:
+				groups = [
+					summaries[start : start + fanout] for start in range(0, len(summaries), fanout)
+				]
+				summaries = list(executor.map(combine, groups))
+
+		return summarizer_fn('\n\n'.join(summaries), title)
 
-		return summaries
+	def iter_summaries(self, chapters: List[ChapterInfo]) -> Iterator[Tuple[int, ChapterInfo]]:
+		"""
+		Iterate over summarized chapters in reading order.
+
+		Args:
+			chapters: List of ChapterInfo with summaries.
+
+		Yields:
+			(depth, chapter) for each chapter with a summary; top-level chapters
+			have depth 0.
+		"""
+		stack = [(chapter, 0) for chapter in reversed(chapters)]
+		while stack:
+			chapter, depth = stack.pop()
+			if chapter.summary:
+				yield depth, chapter
+			stack.extend((child, depth + 1) for child in reversed(chapter.children))
+
+	def _collect_summaries(self, chapters: List[ChapterInfo]) -> List[str]:
+		"""Collect all chapter summaries in reading order."""
+		return [
+			f'## {chapter.title}\n{chapter.summary}' for _, chapter in self.iter_summaries(chapters)
+		]
 
 	def _flatten_chapters(self, chapters: List[ChapterInfo]) -> List[ChapterInfo]:
-		"""Flatten nested chapters into a single list."""
+		"""
+		Flatten nested chapters into a single list.
+
+		The tree returned by get_chapters() is flattened once and reused; the
+		result must not be modified by callers.
+		"""
+		if chapters is self._chapters and self._flat_cache is not None:
+			return self._flat_cache
+
+		# Explicit stack instead of recursion; yields the same preorder
 		result = []
-		for chapter in chapters:
+		stack = list(reversed(chapters))
+		while stack:
+			chapter = stack.pop()
 			result.append(chapter)
 			if chapter.children:
-				result.extend(self._flatten_chapters(chapter.children))
+				stack.extend(reversed(chapter.children))
+
+		if chapters is self._chapters:
+			self._flat_cache = result
 		return result
 
 	def generate_refined_summary(
@@ -317,18 +790,29 @@ class EPUBSummarizer:
 		refine_fn,
 		finalize_fn,
 		book_title: Optional[str] = None,
+		batch_size: int = 8,
+		release_content: bool = True,
+		stream_content: bool = False,
 	) -> BookSummary:
 		"""
 		Generate a book summary using the refine strategy.
 
 		This approach processes chapters sequentially, refining the summary
-		with each new chapter's content.
+		with each new chapter's content. Chapters are refined in batches of
+		batch_size, and groups of batch_size batch summaries are merged into one
+		until one remains, so no refine call has to carry the summary of the
+		whole book.
 
 		Args:
-			chapters: List of ChapterInfo with content loaded.
+			chapters: List of ChapterInfo with content loaded (unless stream_content).
 			refine_fn: Function that refines summary with new chapter.
 			finalize_fn: Function that finalizes the refined summary.
 			book_title: Optional book title, defaults to metadata title.
+			batch_size: Chapters refined per batch. Values below 2 refine all
+				chapters in one sequential pass.
+			release_content: Clear each chapter's content once it is refined.
+			stream_content: Load each chapter's content just before it is refined
+				instead of expecting it to be loaded already.
 
 		Returns:
 			BookSummary object with full summary.
@@ -348,20 +832,20 @@ class EPUBSummarizer:
 				full_summary='',
 			)
 
-		# Process chapters sequentially with refine strategy
-		current_summary = ''
-		for i, chapter in enumerate(flat_chapters, 1):
-			if not chapter.content:
-				continue
+		if stream_content:
+			source = self._iter_loaded_chapters(chapters)
+		else:
+			if release_content:
+				self._release_content_cache()
+			source = ((i, chapter) for i, chapter in enumerate(flat_chapters, 1) if chapter.content)
 
-			print(f"  精煉章節 {i}/{total_chapters}: {chapter.title}")
-			current_summary = refine_fn(
-				existing_summary=current_summary,
-				new_content=chapter.content,
-				new_title=chapter.title,
-				book_title=book_title,
-				chapter_index=i,
-				total_chapters=total_chapters,
+		if batch_size < 2:
+			current_summary = self._refine_sequence(
+				source, refine_fn, book_title, total_chapters, 0, release_content
+			)
+		else:
+			current_summary = self._refine_in_batches(
+				source, refine_fn, book_title, total_chapters, batch_size, release_content
 			)
 
 		# Finalize the summary
@@ -374,6 +858,120 @@ class EPUBSummarizer:
 			full_summary=full_summary,
 		)
 
+	def _refine_in_batches(
+		self,
+		source: Iterator[Tuple[int, ChapterInfo]],
+		refine_fn,
+		book_title: str,
+		total_chapters: int,
+		batch_size: int,
+		release_content: bool,
+	) -> str:
+		"""
+		Refine chapters in batches, then merge batch summaries level by level until one remains.
+
+		Chapters are pulled from source one batch at a time. Each batch starts a new
+		summary, so its chapters are numbered from 1 within the batch. A group of batch
+		summaries is merged by refining the later summaries into the first one, so a
+		batch summary never goes through the first-chapter prompt. Batch summaries are
+		wrapped in ChapterInfo so every level is handled alike.
+
+		Returns:
+			Refined summary of all chapters.
+		"""
+		items: List[ChapterInfo] = []
+		# First and last chapter title covered by each item, for naming batch summaries
+		spans: List[Tuple[str, str]] = []
+		for batch in iter(lambda: list(islice(source, batch_size)), []):
+			first, last = batch[0][1].title, batch[-1][1].title
+			span = f'{batch[0][0]}-{batch[-1][0]}/{total_chapters}'
+			print(f'  精煉第 {len(items) + 1} 批章節 ({span})')
+			summary = self._refine_sequence(
+				enumerate((chapter for _, chapter in batch), 1),
+				refine_fn,
+				book_title,
+				len(batch),
+				0,
+				release_content,
+			)
+			items.append(self._batch_chapter(first, last, summary, 0))
+			spans.append((first, last))
+
+		level = 1
+		while len(items) > 1:
+			next_items, next_spans = [], []
+			for start in range(0, len(items), batch_size):
+				group = items[start : start + batch_size]
+				first, last = spans[start][0], spans[start + len(group) - 1][1]
+				if len(group) == 1:
+					# Nothing to merge; pass the summary on to the next level as it is
+					next_items.append(group[0])
+				else:
+					summary = self._refine_sequence(
+						enumerate(group[1:], 2),
+						refine_fn,
+						book_title,
+						len(group),
+						level,
+						release_content,
+						summary=group[0].content,
+					)
+					next_items.append(self._batch_chapter(first, last, summary, level))
+				next_spans.append((first, last))
+			items, spans = next_items, next_spans
+			level += 1
+
+		return items[0].content if items else ''
+
+	@staticmethod
+	def _batch_chapter(first: str, last: str, summary: str, level: int) -> ChapterInfo:
+		"""Wrap a batch summary as a ChapterInfo titled with the chapters it covers."""
+		title = first if first == last else f'{first} ~ {last}'
+		return ChapterInfo(title=title, target='', level=level, content=summary)
+
+	def _refine_sequence(
+		self,
+		items: Iterable[Tuple[int, ChapterInfo]],
+		refine_fn,
+		book_title: str,
+		total: int,
+		level: int = 0,
+		release_content: bool = False,
+		summary: str = '',
+	) -> str:
+		"""
+		Refine a summary sequentially over (index, chapter) items.
+
+		Args:
+			items: Items in reading order; index is 1-based within total.
+			refine_fn: Function that refines summary with new chapter.
+			book_title: Title of the book.
+			total: Number of items in the sequence.
+			level: 0 for chapters, higher for batch summaries.
+			release_content: Clear each chapter's content once it is refined.
+			summary: Summary to refine the items into. Empty starts a new summary.
+
+		Returns:
+			Refined summary of the items.
+		"""
+		current_summary = summary
+		for index, chapter in items:
+			if level == 0:
+				print(f'  精煉章節 {index}/{total}: {chapter.title}')
+			else:
+				print(f'  合併第 {level} 層摘要 {index}/{total}: {chapter.title}')
+			current_summary = refine_fn(
+				existing_summary=current_summary,
+				new_content=chapter.content,
+				new_title=chapter.title,
+				book_title=book_title,
+				chapter_index=index,
+				total_chapters=total,
+			)
+			if release_content:
+				chapter.content = ''
+		return current_summary
+
 
 # === Example Usage ===
 
@@ -382,46 +980,56 @@ def example_summarizer(content: str, title: str) -> str:
 	Placeholder summarizer function.
 	Replace with actual LLM call (e.g., OpenAI, Anthropic, etc.)
 	"""
-	word_count = len(content.split())
+	# Count matches lazily rather than building the list of words
+	word_count = sum(1 for _ in _WORD.finditer(content))
 	return f"[Summary of '{title}' - {word_count} words]"
 
 
-def print_chapters_tree(chapters: List[ChapterInfo], indent: int = 0) -> None:
-	"""Print chapter structure as a tree."""
-	for chapter in chapters:
-		prefix = '  ' * indent + ('├─ ' if indent > 0 else '')
-		status = '[有內容]' if chapter.content else '[無內容]'
-		print(f"{prefix}{chapter.title} {status}")
-		if chapter.children:
-			print_chapters_tree(chapter.children, indent + 1)
+def print_chapters_tree(
+	chapters: List[ChapterInfo], indent: int = 0, show_status: bool = True
+) -> None:
+	"""Print chapter structure as a tree, optionally marking which chapters have content."""
+	stack = [(chapter, indent) for chapter in reversed(chapters)]
+	while stack:
+		chapter, depth = stack.pop()
+		prefix = '  ' * depth + ('├─ ' if depth > 0 else '')
+		if show_status:
+			status = '[有內容]' if chapter.content else '[無內容]'
+			print(f'{prefix}{chapter.title} {status}')
+		else:
+			print(f'{prefix}{chapter.title}')
+		stack.extend((child, depth + 1) for child in reversed(chapter.children))
 
 
 def print_summaries(chapters: List[ChapterInfo], indent: int = 0) -> None:
 	"""Print chapter summaries."""
-	for chapter in chapters:
+	stack = [(chapter, indent) for chapter in reversed(chapters)]
+	while stack:
+		chapter, depth = stack.pop()
 		if chapter.summary:
-			prefix = '#' * (indent + 2)
+			prefix = '#' * (depth + 2)
 			print(f"\n{prefix} {chapter.title}\n")
 			print(chapter.summary)
-
-		if chapter.children:
-			print_summaries(chapter.children, indent + 1)
+		stack.extend((child, depth + 1) for child in reversed(chapter.children))
 
 
 def count_chapters(chapters: List[ChapterInfo]) -> int:
 	"""Count total chapters including nested ones."""
-	count = len(chapters)
-	for chapter in chapters:
-		count += count_chapters(chapter.children)
+	count = 0
+	stack = list(chapters)
+	while stack:
+		chapter = stack.pop()
+		count += 1
+		stack.extend(chapter.children)
 	return count
 
 
 def sanitize_filename(title: str) -> str:
 	"""Sanitize book title for use as filename."""
 	# Remove or replace invalid filename characters
-	sanitized = re.sub(r'[<>:"/\\|?*]', '', title)
+	sanitized = _INVALID_FILENAME_CHARS.sub('', title)
 	# Replace multiple spaces/underscores with single underscore
-	sanitized = re.sub(r'[\s_]+', '_', sanitized)
+	sanitized = _WHITESPACE_RUN.sub('_', sanitized)
 	# Remove leading/trailing underscores
 	sanitized = sanitized.strip('_')
 	# Limit length
@@ -439,6 +1047,11 @@ def main(
 	output_file: Optional[str] = None,
 	strategy: str = 'map_reduce',
 	provider: str = 'claude',
+	use_batch_api: bool = False,
+	concurrency: int = 8,
+	refine_batch_size: int = 8,
+	use_cache: bool = True,
+	cache_path: Optional[str] = None,
 ):
 	"""
 	Main function for EPUB summarization.
@@ -452,6 +1065,11 @@ def main(
 		output_file: Optional file to save results.
 		strategy: Summarization strategy ('map_reduce' or 'refine').
 		provider: LLM provider ('claude', 'openai', or 'ollama').
+		use_batch_api: Summarize chapters through the provider's batch API (map_reduce only).
+		concurrency: Maximum number of concurrent LLM requests.
+		refine_batch_size: Chapters refined per batch (refine only; below 2 refines all at once).
+		use_cache: Reuse LLM responses cached by earlier runs with the same model and prompt.
+		cache_path: Cache database path (defaults to SummaryCache.DEFAULT_PATH).
 	"""
 	print(f"載入 EPUB: {epub_path}")
 
@@ -463,12 +1081,23 @@ def main(
 	total_chapters = count_chapters(chapters)
 	print(f"找到 {len(chapters)} 個頂層章節，共 {total_chapters} 個章節")
 
-	# 3. Load chapter content
-	print("\n載入章節內容...")
-	summarizer.load_all_chapters(chapters)
+	# 3. Load chapter content. The batch API needs every chapter up front; otherwise
+	# each chapter is loaded as it is summarized, so the whole book is never in memory.
+	preload = strategy == 'map_reduce' and use_batch_api and use_llm
+	if preload:
+		print('\n載入章節內容...')
+		summarizer.load_all_chapters(chapters)
 
 	print("\n章節結構：")
-	print_chapters_tree(chapters)
+	print_chapters_tree(chapters, show_status=preload)
+
+	# Responses are keyed by model and prompt, so re-running on the same book with the
+	# same settings is served from the cache without any API calls
+	cache = None
+	if use_llm and use_cache:
+		from llm import SummaryCache
+
+		cache = SummaryCache(cache_path)
 
 	# 4. Generate summary based on strategy
 	if strategy == 'refine':
@@ -482,6 +1111,8 @@ def main(
 				model=model,
 				language=language,
 				provider=provider,
+				max_concurrency=concurrency,
+				cache=cache,
 			)
 		else:
 			print("\n[測試模式] 使用假摘要 (refine 策略)...")
@@ -491,61 +1122,42 @@ def main(
 				return f"[Final summary of '{book_title}']\n{refined_summary}"
 
 		print("\n使用 Refine 策略生成摘要...")
-		book_summary = summarizer.generate_refined_summary(chapters, refine_fn, finalize_fn)
+		book_summary = summarizer.generate_refined_summary(
+			chapters, refine_fn, finalize_fn, batch_size=refine_batch_size, stream_content=True
+		)
 	else:
 		# Map-Reduce strategy: summarize each chapter then combine
 		if use_llm:
 			from llm import create_summarizer_functions
 
 			print(f"\n使用 {provider.upper()} API 生成摘要 (策略: map_reduce, 語言: {language})...")
-			chapter_fn, book_fn = create_summarizer_functions(
+			chapter_fn, book_fn, achapters_fn = create_summarizer_functions(
 				api_key=api_key,
 				model=model,
 				language=language,
 				provider=provider,
+				max_concurrency=concurrency,
+				use_batch_api=use_batch_api,
+				cache=cache,
 			)
 		else:
 			print("\n[測試模式] 使用假摘要...")
 			chapter_fn = example_summarizer
 			book_fn = example_summarizer
+			achapters_fn = None
 
 		# 5. Generate chapter summaries
 		print("\n生成章節摘要...")
-		summarizer.summarize_all_chapters(chapters, chapter_fn)
+		if preload:
+			asyncio.run(summarizer.asummarize_all_chapters(chapters, achapters_fn))
+		else:
+			summarizer.load_and_summarize_chapters(chapters, chapter_fn, concurrency=concurrency)
 
 		# 6. Generate book summary
 		print("生成全書摘要...")
-		book_summary = summarizer.generate_book_summary(chapters, book_fn)
+		book_summary = summarizer.generate_book_summary(chapters, book_fn, concurrency=concurrency)
 
 	# 7. Output results
-	output_lines = []
-	output_lines.append(f"# {book_summary.title}")
-	output_lines.append("")
-	output_lines.append("## 全書摘要")
-	output_lines.append("")
-	output_lines.append(book_summary.full_summary)
-
-	# Only include chapter summaries for map_reduce strategy
-	if strategy == 'map_reduce':
-		output_lines.append("")
-		output_lines.append("## 章節摘要")
-
-		def collect_summaries(chapters: List[ChapterInfo], level: int = 2) -> List[str]:
-			lines = []
-			for chapter in chapters:
-				if chapter.summary:
-					lines.append("")
-					lines.append(f"{'#' * (level + 1)} {chapter.title}")
-					lines.append("")
-					lines.append(chapter.summary)
-				if chapter.children:
-					lines.extend(collect_summaries(chapter.children, level + 1))
-			return lines
-
-		output_lines.extend(collect_summaries(chapters))
-
-	output_text = '\n'.join(output_lines)
-
 	# Generate output filename if not specified
 	if output_file is None:
 		# Get epub directory for output
@@ -569,11 +1181,21 @@ def main(
 		model_suffix = model_suffix.split('-202')[0]  # Remove date like -20250514 or -2025-08-07
 		output_file = os.path.join(epub_dir, f"{epub_basename}-{strategy_suffix}-{provider_suffix}-{model_suffix}.md")
 
-	# Save output
+	# Save output, writing each section as it is produced rather than joining it all first
 	with open(output_file, 'w', encoding='utf-8') as f:
-		f.write(output_text)
+		f.write(f'# {book_summary.title}\n\n## 全書摘要\n\n{book_summary.full_summary}')
+
+		# Only include chapter summaries for map_reduce strategy
+		if strategy == 'map_reduce':
+			f.write('\n\n## 章節摘要')
+			for depth, chapter in summarizer.iter_summaries(chapters):
+				f.write(f'\n\n{"#" * (depth + 3)} {chapter.title}\n\n{chapter.summary}')
+
 	print(f"\n結果已儲存至: {output_file}")
 
+	if cache is not None:
+		cache.close()
+
 	return book_summary
 
 
@@ -597,6 +1219,9 @@ if __name__ == '__main__':
   # 輸出: book-refine-openai.md
   python summarize.py book.epub --strategy refine --provider openai
 
+  # 使用 Batch API 生成章節摘要（費用較低，需等待批次完成）
+  python summarize.py book.epub --batch-api
+
   # 測試模式（不呼叫 API）
   python summarize.py book.epub --dry-run
 
@@ -612,6 +1237,12 @@ if __name__ == '__main__':
   # 使用 Ollama 指定模型
   python summarize.py book.epub --provider ollama --model llama3:70b
 
+  # 降低同時請求數（本地模型或 API 速率限制較低時）
+  python summarize.py book.epub --provider ollama --concurrency 2
+
+  # 不使用快取，重新呼叫 API 生成摘要
+  python summarize.py book.epub --no-cache
+
 策略說明:
   map_reduce: 先為每個章節生成摘要，再合併成全書摘要（產生章節摘要）
   refine: 逐章節精煉摘要，最終產生全書摘要（僅產生全書摘要，更連貫）
@@ -654,6 +1285,32 @@ LLM 提供者:
 		default='zh-TW(繁體中文/正體中文)',
 		help='輸出語言（預設: zh-TW(繁體中文/正體中文)）',
 	)
+	parser.add_argument(
+		'--batch-api',
+		action='store_true',
+		help='使用 Batch API 生成章節摘要（費用較低，但需等待批次完成；僅 claude/openai）',
+	)
+	parser.add_argument(
+		'--concurrency',
+		type=int,
+		default=8,
+		help='同時進行的 LLM 請求數上限（預設: 8）',
+	)
+	parser.add_argument(
+		'--refine-batch-size',
+		type=int,
+		default=8,
+		help='refine 每批精煉的章節數，各批摘要再逐層合併（預設: 8；0 則依序精煉全部章節）',
+	)
+	parser.add_argument(
+		'--no-cache',
+		action='store_true',
+		help='不使用先前執行快取的 LLM 回應',
+	)
+	parser.add_argument(
+		'--cache-path',
+		help='LLM 回應快取檔案路徑（預設: ~/.cache/epub-summarization/summaries.sqlite）',
+	)
 	parser.add_argument(
 		'-o', '--output',
 		help='輸出檔案路徑（預設: [epub檔名]-[策略]-[provider].md）',
@@ -670,4 +1327,9 @@ LLM 提供者:
 		output_file=args.output,
 		strategy=args.strategy,
 		provider=args.provider,
+		use_batch_api=args.batch_api,
+		concurrency=args.concurrency,
+		refine_batch_size=args.refine_batch_size,
+		use_cache=not args.no_cache,
+		cache_path=args.cache_path,
 	)
@@ -1,11 +1,12 @@
-import re
-
 from lxml import etree
 
 from epub_utils.content.base import Content
 from epub_utils.exceptions import ParseError, UnsupportedFormatError
 from epub_utils.printers import XMLPrinter
 
+_BODY_ELEMENTS = etree.XPath('//*[local-name()="body"]')
+_STRING_VALUE = etree.XPath('string()')
+
 
 class XHTMLContent(Content):
 	"""
@@ -71,14 +72,11 @@ class XHTMLContent(Content):
 	def inner_text(self) -> str:
 		tree = self.tree
 
-		body_elements = tree.xpath('//*[local-name()="body"]')
+		body_elements = _BODY_ELEMENTS(tree)
 
-		if body_elements:
-			inner_text = ''.join(body_elements[0].itertext())
-		else:
-			inner_text = ''.join(tree.itertext())
+		# The XPath string-value is assembled inside libxml2 rather than by
+		# joining itertext() fragments in Python.
+		inner_text = _STRING_VALUE(body_elements[0] if body_elements else tree)
 
 		# Normalize whitespace
-		inner_text = re.sub(r'\s+', ' ', inner_text).strip()
-
-		return inner_text
+		return ' '.join(inner_text.split())
@@ -0,0 +1,426 @@
+import asyncio
+from types import SimpleNamespace
+
+from llm import BaseSummarizer, ClaudeSummarizer, OllamaSummarizer, SummaryCache
+
+
+class FakeSummarizer(BaseSummarizer):
+	"""Summarizer that records prompts instead of calling a provider."""
+
+	model = 'fake'
+
+	def __init__(self, padding: int = 0, **kwargs):
+		super().__init__(**kwargs)
+		self.padding = padding
+		self.prompts = []
+
+	def _call_api(self, prompt: str) -> str:
+		self.prompts.append(prompt)
+		return f'summary {len(self.prompts)}' + '.' * self.padding
+
+	async def _acall_api(self, prompt: str) -> str:
+		await asyncio.sleep(0)
+		return self._call_api(prompt)
+
+	def _create_aclient(self):
+		return FakeAsyncClient()
+
+
+class FakeAsyncClient:
+	"""Async client stand-in that records whether it was closed."""
+
+	closed = False
+
+	async def close(self) -> None:
+		self.closed = True
+
+
+def test_call_with_backoff_without_retries():
+	"""
+	Test that max_retries=0 still makes the async API call once.
+	"""
+	summarizer = FakeSummarizer(max_retries=0)
+	result = asyncio.run(summarizer._call_with_backoff('prompt'))
+	assert result == 'summary 1'
+	assert len(summarizer.prompts) == 1
+
+
+def test_summary_cache_hit_and_miss():
+	"""
+	Test that the cache returns stored responses and None for unknown keys.
+	"""
+	cache = SummaryCache(':memory:')
+	key = SummaryCache.make_key('model', 'prompt')
+	assert cache.get(key) is None
+
+	cache.put(key, 'response', 'model')
+	assert cache.get(key) == 'response'
+
+
+def test_summary_cache_keys_by_model_and_prompt():
+	"""
+	Test that cache keys differ by model and by prompt.
+	"""
+	key = SummaryCache.make_key('model', 'prompt')
+	assert key == SummaryCache.make_key('model', 'prompt')
+	assert key != SummaryCache.make_key('other-model', 'prompt')
+	assert key != SummaryCache.make_key('model', 'other prompt')
+
+
+def test_summary_cache_keys_by_language():
+	"""
+	Test that the same chapter summarized in another language is not served from the cache.
+	"""
+	summarizer = FakeSummarizer(cache=SummaryCache(':memory:'))
+	assert summarizer.summarize_chapter('content', 'title', 'zh-TW') == 'summary 1'
+	assert summarizer.summarize_chapter('content', 'title', 'en') == 'summary 2'
+	assert summarizer.summarize_chapter('content', 'title', 'zh-TW') == 'summary 1'
+	assert len(summarizer.prompts) == 2
+
+
+def test_summary_cache_persists(tmp_path):
+	"""
+	Test that responses are still cached after reopening the database file.
+	"""
+	path = str(tmp_path / 'cache' / 'summaries.sqlite')
+	key = SummaryCache.make_key('model', 'prompt')
+	cache = SummaryCache(path)
+	cache.put(key, 'response', 'model')
+	cache.close()
+
+	cache = SummaryCache(path)
+	assert cache.get(key) == 'response'
+	cache.close()
+
+
+class FakeClaudeClient:
+	"""Sync Anthropic client stand-in for the batch and streaming endpoints."""
+
+	def __init__(self, failed_ids):
+		self.failed_ids = failed_ids
+		self.requests = []
+		self.streamed = []
+		self.messages = SimpleNamespace(batches=self, stream=self.stream)
+
+	def create(self, requests):
+		self.requests = requests
+		return SimpleNamespace(id='batch', processing_status='ended')
+
+	def results(self, batch_id):
+		# Results come back in no particular order
+		for request in reversed(self.requests):
+			custom_id = request['custom_id']
+			if custom_id in self.failed_ids:
+				result = SimpleNamespace(type='errored')
+			else:
+				text = f'batch {custom_id}'
+				result = SimpleNamespace(
+					type='succeeded', message=SimpleNamespace(content=[SimpleNamespace(text=text)])
+				)
+			yield SimpleNamespace(custom_id=custom_id, result=result)
+
+	def stream(self, **params):
+		self.streamed.append(params)
+		return FakeStream(['retried'])
+
+
+class FakeStream:
+	def __init__(self, chunks):
+		self.text_stream = chunks
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		return False
+
+
+def test_summarize_chapters_batch():
+	"""
+	Test that batch results are returned in chapter order and failed requests are retried.
+	"""
+	summarizer = ClaudeSummarizer(api_key='test')
+	client = FakeClaudeClient(failed_ids={'ch-2'})
+	summarizer.__dict__['client'] = client
+
+	summaries = summarizer.summarize_chapters_batch(
+		[('content 0', 'Ch0'), ('', 'Empty'), ('content 2', 'Ch2'), ('content 3', 'Ch3')]
+	)
+	assert summaries == ['batch ch-0', '', 'retried', 'batch ch-3']
+	assert [request['custom_id'] for request in client.requests] == ['ch-0', 'ch-2', 'ch-3']
+	assert len(client.streamed) == 1
+	assert 'content 2' in client.streamed[0]['messages'][0]['content']
+
+
+def test_loop_resources_released_after_runs():
+	"""
+	Test that resources of closed event loops are dropped, even when a contended
+	semaphore references its loop.
+	"""
+	summarizer = FakeSummarizer(max_concurrency=1)
+
+	async def run():
+		await asyncio.gather(*[summarizer._call_with_backoff('prompt') for _ in range(3)])
+
+	for _ in range(3):
+		asyncio.run(run())
+		assert len(summarizer._loop_resources) == 1
+
+
+def test_async_context_closes_client():
+	"""
+	Test that leaving ``async with summarizer`` closes the loop's client.
+	"""
+	summarizer = FakeSummarizer()
+
+	async def run():
+		async with summarizer:
+			return summarizer.aclient
+
+	client = asyncio.run(run())
+	assert client.closed
+	assert summarizer._loop_resources == {}
+
+
+def test_call_with_retry_without_retries():
+	"""
+	Test that max_retries=0 still makes the sync API call once.
+	"""
+	summarizer = FakeSummarizer(max_retries=0)
+	assert summarizer._call_with_retry('prompt') == 'summary 1'
+	assert len(summarizer.prompts) == 1
+
+
+def test_summarize_chapter_stream_holds_concurrency_slot():
+	"""
+	Test that a sync stream occupies a concurrency slot until it is exhausted.
+	"""
+	summarizer = FakeSummarizer(max_concurrency=1)
+	stream = summarizer.summarize_chapter_stream('content', 'title')
+	assert next(stream) == 'summary 1'
+	assert not summarizer._thread_sem.acquire(blocking=False)
+
+	assert list(stream) == []
+	assert summarizer._thread_sem.acquire(blocking=False)
+
+
+def test_summarize_and_refine_interleaves_refine_calls():
+	"""
+	Test that chapter summaries run only a small window ahead of the refine chain.
+	"""
+	summarizer = FakeSummarizer(max_concurrency=3)
+	chapters = [(f'chapter text {i}', f'Chapter {i}') for i in range(8)]
+	refined, summaries = asyncio.run(summarizer.asummarize_and_refine(chapters, 'Book'))
+
+	assert len(summarizer.prompts) == 16
+	assert refined == 'summary 16'
+	started = refines = 0
+	for prompt in summarizer.prompts:
+		if 'chapter text' in prompt:
+			started += 1
+		else:
+			refines += 1
+			# Each refine frees one slot; max_concurrency=3 leaves a window of two
+			assert started <= refines + 2
+	chapter_prompts = [prompt for prompt in summarizer.prompts if 'chapter text' in prompt]
+	assert all(f'chapter text {i}' in prompt for i, prompt in enumerate(chapter_prompts))
+	assert all(summary.startswith('summary') for summary in summaries)
+
+
+def test_truncate_content_over_limit():
+	"""
+	Test that content over MAX_CONTENT_TOKENS is trimmed to the budget and marked.
+	"""
+	summarizer = FakeSummarizer()
+	summarizer.MAX_CONTENT_TOKENS = 100
+	content = '字' * 150 + 'a' * 400
+
+	truncated = summarizer._truncate_content(content)
+	assert truncated.endswith('[內容已截斷...]')
+	kept = truncated.removesuffix('\n\n[內容已截斷...]')
+	assert content.startswith(kept)
+	assert 0 < summarizer._count_tokens(kept) <= 100
+
+	summarizer.summarize_chapter(content, 'Title')
+	assert content not in summarizer.prompts[0]
+	assert kept in summarizer.prompts[0]
+
+
+def test_truncate_content_at_limit():
+	"""
+	Test that content of exactly MAX_CONTENT_TOKENS tokens is left untouched.
+	"""
+	summarizer = FakeSummarizer()
+	summarizer.MAX_CONTENT_TOKENS = 100
+	for content in ('字' * 100, 'a' * 400, '字' * 50 + 'a' * 200):
+		assert summarizer._count_tokens(content) == 100
+		assert summarizer._truncate_content(content) == content
+	assert summarizer._truncate_content('字' * 101) != '字' * 101
+
+
+def test_refine_summary_compresses_every_k_passes():
+	"""
+	Test that an over-long summary is compressed once per REFINE_COMPRESS_EVERY passes.
+	"""
+	summarizer = FakeSummarizer(padding=4 * BaseSummarizer.REFINE_SUMMARY_TOKENS)
+	summary = summarizer.refine_summary('', 'content 1', 'Chapter 1', 'Book', 1, 10)
+	compressions = []
+	for index in range(2, 11):
+		previous = summary
+		start = len(summarizer.prompts)
+		summary = summarizer.refine_summary(
+			previous, f'content {index}', f'Chapter {index}', 'Book', index, 10
+		)
+		prompts = summarizer.prompts[start:]
+		if len(prompts) == 2:
+			# The compressed form is rebuilt from the latest summary
+			assert previous in prompts[0]
+			compressions.append(index)
+			compressed = f'summary {start + 1}.'
+		assert previous not in prompts[-1]
+		assert compressed in prompts[-1]
+
+	assert compressions == [2, 6, 10]
+
+
+def test_refine_summary_limit_counts_tokens():
+	"""
+	Test that the running summary limit is measured in tokens, not characters.
+	"""
+	summarizer = FakeSummarizer()
+	english = 'word ' * 800
+	summarizer.refine_summary(english, 'content', 'Chapter 2', 'Book', 2, 2)
+	assert len(summarizer.prompts) == 1
+	assert english in summarizer.prompts[0]
+
+	chinese = '摘要' * 800
+	summarizer.refine_summary(chinese, 'content', 'Chapter 2', 'Book', 2, 2)
+	assert len(summarizer.prompts) == 3
+	assert chinese in summarizer.prompts[1]
+	assert chinese not in summarizer.prompts[2]
+
+
+def test_refine_summary_runs_are_independent():
+	"""
+	Test that interleaved refine runs on one summarizer only see their own summaries.
+	"""
+	summarizer = FakeSummarizer(padding=4 * BaseSummarizer.REFINE_SUMMARY_TOKENS)
+	first = summarizer.refine_summary('', 'content a', 'Chapter A', 'Book A', 1, 3)
+	second = summarizer.refine_summary('', 'content b', 'Chapter B', 'Book B', 1, 3)
+
+	first = summarizer.refine_summary(first, 'content a2', 'Chapter A2', 'Book A', 2, 3)
+	assert all('Book B' not in prompt for prompt in summarizer.prompts[-2:])
+	compressed_first = f'summary {len(summarizer.prompts) - 1}.'
+	second = summarizer.refine_summary(second, 'content b2', 'Chapter B2', 'Book B', 2, 3)
+	assert all('Book A' not in prompt for prompt in summarizer.prompts[-2:])
+	compressed_second = f'summary {len(summarizer.prompts) - 1}.'
+
+	# Each run reuses its own compressed form on the next pass
+	summarizer.refine_summary(first, 'content a3', 'Chapter A3', 'Book A', 3, 3)
+	assert compressed_first in summarizer.prompts[-1]
+	summarizer.refine_summary(second, 'content b3', 'Chapter B3', 'Book B', 3, 3)
+	assert compressed_second in summarizer.prompts[-1]
+	assert compressed_first not in summarizer.prompts[-1]
+	assert len(summarizer.prompts) == 8
+
+
+def ollama_summarizer(language: str) -> OllamaSummarizer:
+	summarizer = OllamaSummarizer()
+	summarizer._language = summarizer._expand_language(language)
+	return summarizer
+
+
+class FakeOllamaClient:
+	"""Chat completions stand-in that records request parameters."""
+
+	def __init__(self, reply):
+		self.reply = reply
+		self.requests = []
+		self.chat = SimpleNamespace(completions=self)
+
+	def create(self, **params):
+		self.requests.append(params)
+		message = SimpleNamespace(content=self.reply)
+		return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeAsyncOllamaClient(FakeOllamaClient):
+	async def create(self, **params):
+		return super().create(**params)
+
+	async def close(self) -> None:
+		pass
+
+
+def test_ollama_chapter_stream_tracks_language():
+	"""
+	Test that the Ollama stream methods request output in the given language.
+	"""
+	summarizer = OllamaSummarizer()
+	client = FakeOllamaClient('An English summary.')
+	summarizer.__dict__['client'] = client
+	chunks = list(summarizer.summarize_chapter_stream('content', 'Title', language='en'))
+	assert chunks == ['An English summary.']
+	assert summarizer._language == 'en'
+	assert len(client.requests) == 1
+	assert 'en' in client.requests[0]['messages'][0]['content']
+	assert '繁體' not in client.requests[0]['messages'][0]['content']
+
+	aclient = FakeAsyncOllamaClient('這是摘要。')
+	summarizer._create_aclient = lambda: aclient
+
+	async def stream():
+		return [chunk async for chunk in summarizer.asummarize_chapter_stream('content', 'Title')]
+
+	assert asyncio.run(stream()) == ['這是摘要。']
+	assert summarizer._language == 'zh-TW(繁體中文/正體中文)'
+	assert len(aclient.requests) == 1
+	assert '繁體' in aclient.requests[0]['messages'][0]['content']
+
+
+def test_needs_conversion_traditional_chinese():
+	"""
+	Test that Traditional Chinese output is kept for a zh-TW target.
+	"""
+	summarizer = ollama_summarizer('zh-TW')
+	assert not summarizer._needs_conversion(
+		'這本書討論經濟發展與社會變遷的關係，並提出三個主要論點。'
+	)
+
+
+def test_needs_conversion_simplified_chinese():
+	"""
+	Test that Simplified Chinese output is converted for a zh-TW target.
+	"""
+	summarizer = ollama_summarizer('zh-TW')
+	assert summarizer._needs_conversion('这本书讨论经济发展与社会变迁的关系，并提出三个主要论点。')
+
+
+def test_needs_conversion_english_for_chinese_target():
+	"""
+	Test that English output is converted for a zh-TW target.
+	"""
+	summarizer = ollama_summarizer('zh-TW')
+	assert summarizer._needs_conversion(
+		'This book discusses the relationship between economic growth and social change.'
+	)
+
+
+def test_needs_conversion_chinese_for_english_target():
+	"""
+	Test that Chinese output is converted for an en target, and English output is kept.
+	"""
+	summarizer = ollama_summarizer('en')
+	assert summarizer._needs_conversion('這本書討論經濟發展與社會變遷的關係，並提出三個主要論點。')
+	assert not summarizer._needs_conversion(
+		'This book discusses the relationship between economic growth and social change.'
+	)
+
+
+def test_needs_conversion_without_letters():
+	"""
+	Test that text with no letters or CJK characters is never converted.
+	"""
+	summarizer = ollama_summarizer('zh-TW')
+	assert not summarizer._needs_conversion('')
+	assert not summarizer._needs_conversion('1. 2024 — 42%, (3/4)!')
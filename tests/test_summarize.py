@@ -0,0 +1,205 @@
+import threading
+import time
+
+import pytest
+
+from summarize import ChapterInfo, EPUBSummarizer, _prefetch
+
+
+def make_chapters(count: int):
+	return [
+		ChapterInfo(title=f'Ch{i}', target='', level=1, content=f'content {i}')
+		for i in range(1, count + 1)
+	]
+
+
+def test_generate_refined_summary_batch_indices(doc_path):
+	"""
+	Test that batched refining numbers chapters within each batch and only sends
+	the first chapter of a batch through the initial prompt.
+	"""
+	calls = []
+
+	def refine_fn(
+		existing_summary, new_content, new_title, book_title, chapter_index, total_chapters
+	):
+		calls.append((bool(existing_summary), new_title, chapter_index, total_chapters))
+		return f'S({new_title})'
+
+	summarizer = EPUBSummarizer(doc_path)
+	book_summary = summarizer.generate_refined_summary(
+		make_chapters(20),
+		refine_fn,
+		lambda refined_summary, book_title: refined_summary,
+		book_title='Book',
+		batch_size=3,
+		release_content=False,
+	)
+
+	# Level 0: batches of 3 chapters (the last has 2), numbered from 1 in each batch
+	chapter_calls = calls[:20]
+	assert [call[2:] for call in chapter_calls] == [(i, 3) for i in (1, 2, 3)] * 6 + [
+		(1, 2),
+		(2, 2),
+	]
+	assert [call[0] for call in chapter_calls] == [False, True, True] * 6 + [False, True]
+
+	# Merge levels: 7 batch summaries -> groups of 3, 3 and 1 -> one group of 3.
+	# Each group refines into its first summary; the lone summary is passed through.
+	assert calls[20:] == [
+		(True, 'Ch4 ~ Ch6', 2, 3),
+		(True, 'Ch7 ~ Ch9', 3, 3),
+		(True, 'Ch13 ~ Ch15', 2, 3),
+		(True, 'Ch16 ~ Ch18', 3, 3),
+		(True, 'Ch10 ~ Ch18', 2, 3),
+		(True, 'Ch19 ~ Ch20', 3, 3),
+	]
+	assert book_summary.full_summary == 'S(Ch19 ~ Ch20)'
+
+
+def test_iter_chapter_content_evicts_files_read(doc_path):
+	"""
+	Test that streaming chapters drops each chapter's cached files, including
+	fallback paths outside the spine, but keeps files the next chapter reads.
+	"""
+	summarizer = EPUBSummarizer(doc_path)
+	summarizer._nav_base_path = ''
+	summarizer._spine_hrefs = ['a.xhtml', 'b.xhtml', 'c.xhtml']
+	summarizer._href_to_spine_index = {'a.xhtml': 0, 'b.xhtml': 1, 'c.xhtml': 2}
+	summarizer._content_cache.update(
+		{'a.xhtml': 'A', 'b.xhtml': 'B', 'c.xhtml': 'C', 'extra.xhtml': 'E'}
+	)
+	chapters = [
+		ChapterInfo(title='Ch1', target='a.xhtml', level=1),
+		ChapterInfo(title='Ch2', target='extra.xhtml', level=1),
+		ChapterInfo(title='Ch3', target='c.xhtml', level=1),
+	]
+
+	cached = []
+	contents = []
+	for _, content in summarizer.iter_chapter_content(chapters):
+		contents.append(content)
+		cached.append(set(summarizer._content_cache))
+
+	assert contents == ['A', 'E', 'C']
+	assert cached == [{'c.xhtml', 'extra.xhtml'}, {'c.xhtml'}, set()]
+
+
+def test_tree_reduce_passes_single_summaries_through():
+	"""
+	Test that tree reduction never spends a call on a group of one summary.
+	"""
+	calls = []
+
+	def summarizer_fn(text, title):
+		calls.append(text)
+		return '(' + ','.join(text.split('\n\n')) + ')'
+
+	summaries = [f's{i}' for i in range(1, 21)]
+	result = EPUBSummarizer._tree_reduce(summaries, summarizer_fn, 'Book', fanout=3, concurrency=1)
+	assert result == (
+		'(((s1,s2,s3),(s4,s5,s6),(s7,s8,s9)),((s10,s11,s12),(s13,s14,s15),(s16,s17,s18)),(s19,s20))'
+	)
+	assert len(calls) == 10
+
+	calls.clear()
+	summaries = [f's{i}' for i in range(1, 10)]
+	result = EPUBSummarizer._tree_reduce(summaries, summarizer_fn, 'Book', fanout=8, concurrency=1)
+	assert result == '((s1,s2,s3,s4,s5,s6,s7,s8),s9)'
+	assert len(calls) == 2
+
+
+def test_summarize_all_chapters_dedups_by_function_title_and_content(doc_path):
+	"""
+	Test that repeated chapters are summarized once, but a summary is not reused
+	under another title or by a different summarizer function.
+	"""
+	calls = []
+
+	def summarizer_fn(content, title):
+		calls.append((content, title))
+		return f'summary {len(calls)}'
+
+	def other_fn(content, title):
+		calls.append((content, title))
+		return f'other {len(calls)}'
+
+	summarizer = EPUBSummarizer(doc_path)
+	chapters = [
+		ChapterInfo(title='Notes', target='', level=1, content='same text'),
+		ChapterInfo(title='Notes', target='', level=1, content='same text'),
+		ChapterInfo(title='Appendix', target='', level=1, content='same text'),
+	]
+	summarizer.summarize_all_chapters(chapters, summarizer_fn, concurrency=1, release_content=False)
+	assert sorted(calls) == [('same text', 'Appendix'), ('same text', 'Notes')]
+	assert chapters[0].summary == chapters[1].summary != chapters[2].summary
+	appendix = chapters[2].summary
+
+	# The same function reuses its summaries; another one gets its own
+	summarizer.summarize_all_chapters(chapters, summarizer_fn, concurrency=1, release_content=False)
+	assert len(calls) == 2
+	summarizer.summarize_all_chapters(chapters, other_fn, concurrency=1, release_content=False)
+	assert len(calls) == 4
+	assert all(chapter.summary.startswith('other') for chapter in chapters)
+	assert summarizer.summarize_chapter(chapters[2], summarizer_fn) == appendix
+	assert len(calls) == 4
+
+
+def test_iter_chapter_content_prefetch_keeps_order(doc_path):
+	"""
+	Test that prefetching yields the same chapters and content in the same order.
+	"""
+	chapters = EPUBSummarizer(doc_path).get_chapters()
+	plain = [
+		(chapter.title, content)
+		for chapter, content in EPUBSummarizer(doc_path).iter_chapter_content(chapters)
+	]
+	prefetched = [
+		(chapter.title, content)
+		for chapter, content in EPUBSummarizer(doc_path).iter_chapter_content(chapters, prefetch=2)
+	]
+	assert plain
+	assert prefetched == plain
+	assert list(_prefetch(range(20), maxsize=2)) == list(range(20))
+
+
+def test_prefetch_reraises_worker_exception():
+	"""
+	Test that an exception raised on the background thread reaches the consumer.
+	"""
+
+	def items():
+		yield 1
+		yield 2
+		raise ValueError('bad chapter')
+
+	results = []
+	with pytest.raises(ValueError, match='bad chapter'):
+		for item in _prefetch(items()):
+			results.append(item)
+	assert results == [1, 2]
+
+
+def test_prefetch_stops_thread_when_consumer_quits():
+	"""
+	Test that the background thread stops reading once the consumer stops early.
+	"""
+	produced = []
+
+	def items():
+		for i in range(1000):
+			produced.append(i)
+			yield i
+
+	threads = threading.active_count()
+	iterator = _prefetch(items(), maxsize=2)
+	assert [next(iterator) for _ in range(3)] == [0, 1, 2]
+	iterator.close()
+
+	for _ in range(50):
+		if threading.active_count() == threads:
+			break
+		time.sleep(0.05)
+	assert threading.active_count() == threads
+	# At most the buffer, plus the item the thread was trying to put, was read ahead
+	assert len(produced) <= 3 + 2 + 1
@@ -58,3 +58,27 @@ def test_to_str_pretty_print_parameter(xml_content, pretty_print, expected):
 	content = XHTMLContent(xml_content, 'application/xhtml+xml', 'test.xhtml')
 
 	assert content.to_str(pretty_print=pretty_print) == expected
+
+
+@pytest.mark.parametrize(
+	'xml_content,expected',
+	[
+		(
+			(
+				'<html xmlns="http://www.w3.org/1999/xhtml"><head><title>Skipped</title></head>'
+				'<body>\n\t<p>One <em>two</em>\n<span>three <b>four</b></span></p>'
+				'<p>five</p></body></html>'
+			),
+			'One two three fourfive',
+		),
+		(
+			'<section><h1>No   body</h1>\n<p>Still <i>text</i></p></section>',
+			'No body Still text',
+		),
+	],
+)
+def test_inner_text_nested_markup(xml_content, expected):
+	"""Test text extraction across nested inline markup and without a body element."""
+	content = XHTMLContent(xml_content, 'application/xhtml+xml', 'test.xhtml')
+
+	assert content.inner_text == expected